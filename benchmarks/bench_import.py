@@ -0,0 +1,155 @@
+"""Import time of the Alerte Nowcasting modules, measured with python -X importtime.
+
+Each module is imported in a fresh interpreter; the report shows the cumulative
+time of the module itself and of the integration modules it pulled in.
+
+The parser is also imported on its own, without the package __init__, and must
+not load Home Assistant or aiohttp: it runs in executors and offline tools.
+That check needs no dependencies; the per-module figures require the dev
+requirements (Home Assistant).
+
+Usage:
+    python benchmarks/bench_import.py
+    python benchmarks/bench_import.py --repeat 10 --save imports.json
+    python benchmarks/bench_import.py --compare imports.json --threshold 1.25
+    python benchmarks/bench_import.py --standalone-only
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+PACKAGE = "custom_components.alerta_nowcasting"
+MODULES = ("config_flow", "sensor", "diagnostics", "services", "coordinator", "parser")
+
+# Modulul importat fără __init__-ul pachetului și dependențele interzise pentru el
+STANDALONE = "parser"
+FORBIDDEN = ("homeassistant", "aiohttp")
+
+# Pachete „goale” în locul __init__-ului, ca să fie importat doar modulul cerut
+_STANDALONE_CODE = """\
+import sys, types
+for name in ("custom_components", "{package}"):
+    package = types.ModuleType(name)
+    package.__path__ = [name.replace(".", "/")]
+    sys.modules[name] = package
+import {package}.{module}
+"""
+
+
+def import_times(module: str, standalone: bool = False) -> dict[str, tuple[int, int]]:
+    """Return the (self, cumulative) import time in µs of every module loaded by module."""
+    code = (
+        _STANDALONE_CODE.format(package=PACKAGE, module=module)
+        if standalone
+        else f"import {PACKAGE}.{module}"
+    )
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    # Format: "import time: self [us] | cumulative | imported package"
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        own, cumulative, name = line.removeprefix("import time:").split("|")
+        times[name.strip()] = (int(own), int(cumulative))
+    return times
+
+
+def _own_ms(run: dict[str, tuple[int, int]]) -> float:
+    """Return the time (ms) spent in the integration modules themselves."""
+    return sum(
+        self_us
+        for name, (self_us, _) in run.items()
+        if name == PACKAGE or name.startswith(f"{PACKAGE}.")
+    ) / 1000
+
+
+def bench_standalone(repeat: int) -> tuple[dict[str, float], list[str]]:
+    """Measure the standalone parser import; return the result and the forbidden modules it loaded."""
+    runs = [import_times(STANDALONE, standalone=True) for _ in range(repeat)]
+    total = statistics.median(run[f"{PACKAGE}.{STANDALONE}"][1] for run in runs) / 1000
+    loaded = [
+        name
+        for name in runs[0]
+        if name.split(".")[0] in FORBIDDEN
+    ]
+    return {"total_ms": total, "own_ms": statistics.median(map(_own_ms, runs))}, loaded
+
+
+def bench_modules(repeat: int) -> dict[str, dict[str, float]]:
+    """Measure the import of every integration module through the package."""
+    results = {}
+    for module in MODULES:
+        runs = [import_times(module) for _ in range(repeat)]
+        # Pachetul (__init__) se importă întotdeauna înaintea modulului
+        total = statistics.median(
+            run[PACKAGE][1] + run[f"{PACKAGE}.{module}"][1] for run in runs
+        ) / 1000
+        results[module] = {"total_ms": total, "own_ms": statistics.median(map(_own_ms, runs))}
+    return results
+
+
+def compare(results: dict[str, dict[str, float]], baseline_path: Path, threshold: float) -> list[str]:
+    """Return the modules whose import time regressed past the threshold."""
+    baseline = json.loads(baseline_path.read_text(encoding="utf-8"))
+    regressions = []
+    for name, current in results.items():
+        if (previous := baseline.get(name)) is None:
+            continue
+        for metric in ("total_ms", "own_ms"):
+            if previous[metric] > 0 and current[metric] > previous[metric] * threshold:
+                regressions.append(
+                    f"{name} {metric}: {previous[metric]:.2f} -> {current[metric]:.2f}"
+                )
+    return regressions
+
+
+def main() -> int:
+    """Print the median import time of each integration module."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5, help="fresh interpreters per module")
+    parser.add_argument("--standalone-only", action="store_true", help="only the standalone parser check")
+    parser.add_argument("--save", type=Path, help="write results as JSON (baseline)")
+    parser.add_argument("--compare", type=Path, help="baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=1.25, help="allowed slowdown factor")
+    args = parser.parse_args()
+
+    standalone, forbidden = bench_standalone(args.repeat)
+    results = {f"{STANDALONE} (standalone)": standalone}
+    if not args.standalone_only:
+        results.update(bench_modules(args.repeat))
+
+    print(f"{'module':<24}{'total ms':>12}{'package ms':>12}")
+    for name, result in results.items():
+        print(f"{name:<24}{result['total_ms']:>12.1f}{result['own_ms']:>12.1f}")
+
+    if args.save:
+        args.save.write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+    failed = False
+    if forbidden:
+        print(f"\n{STANDALONE} loaded forbidden modules: {', '.join(forbidden)}")
+        failed = True
+    if args.compare:
+        if regressions := compare(results, args.compare, args.threshold):
+            print("\nRegressions:")
+            print("\n".join(f"  {line}" for line in regressions))
+            failed = True
+        else:
+            print("\nNo regressions.")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,412 @@
+"""Offline benchmarks for the Alerte Nowcasting parsing pipeline.
+
+Builds synthetic feeds with 0-500 <avertizare> elements and multi-county zona
+HTML, then measures time and peak memory for:
+
+- the coordinator's download (_async_request_source) + parse through a local
+  stand-in for the feed endpoint: full download, 304, unchanged fingerprint,
+  HTML error page and oversized response
+- parse_feed (the coordinator's _parse_xml) on raw chunks
+- extract_counties and detect_phenomena
+- sensor attribute generation for 1 to 42 county sensors
+
+Runs fully offline. Requires the dev requirements (Home Assistant, aiohttp).
+
+Usage:
+    python benchmarks/bench_parsing.py
+    python benchmarks/bench_parsing.py --save baseline.json
+    python benchmarks/bench_parsing.py --compare baseline.json --threshold 1.25
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import gc
+import hashlib
+import json
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from collections.abc import Awaitable, Callable
+from datetime import timedelta
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+from xml.sax.saxutils import quoteattr
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from aiohttp import ClientSession, hdrs, web  # noqa: E402
+
+from homeassistant.helpers.update_coordinator import UpdateFailed  # noqa: E402
+from homeassistant.util import dt as dt_util  # noqa: E402
+
+from custom_components.alerta_nowcasting.const import (  # noqa: E402
+    MAX_PAYLOAD_SIZE,
+    ROMANIAN_COUNTIES,
+)
+from custom_components.alerta_nowcasting.coordinator import (  # noqa: E402
+    _CHUNK_SIZE,
+    AlerteNowcastingCoordinator,
+    AlerteNowcastingView,
+    FeedSource,
+)
+from custom_components.alerta_nowcasting.models import Alert  # noqa: E402
+from custom_components.alerta_nowcasting.parser import (  # noqa: E402
+    county_keys,
+    detect_phenomena,
+    extract_counties,
+    parse_feed,
+)
+from custom_components.alerta_nowcasting.sensor import AlerteNowcastingSensor  # noqa: E402
+
+FEED_SIZES = (0, 1, 10, 50, 100, 250, 500)
+SENSOR_COUNTS = (1, 5, 14, 42)
+
+_LOCALITIES = (
+    "Cluj-Napoca", "Florești", "Gilău", "Turda", "Dej", "Câmpia Turzii", "Sighișoara",
+    "Târgu Mureș", "Reghin", "Mediaș", "Făgăraș", "Zărnești", "Râșnov", "Curtea de Argeș",
+    "Câmpulung", "Piatra Neamț", "Vatra Dornei", "Băile Herculane", "Sinaia", "Bușteni",
+)
+_DESCRIPTIONS = (
+    "Ploi torențiale ce vor cumula 30-40 l/mp și izolat peste 50 l/mp, descărcări "
+    "electrice frecvente, intensificări ale vântului, cu rafale de 60-70 km/h.",
+    "Intensificări ale vântului cu rafale de 50-60 km/h. În zona montană rafalele "
+    "vor depăși 70-80 km/h.",
+    "Averse torențiale, grindină de dimensiuni medii, vijelie și descărcări electrice.",
+    "Ceață care determină reducerea vizibilității sub 200 m, izolat sub 50 m. Polei.",
+    "Ninsori moderate, viscol în zona de munte, strat de zăpadă de 10-15 cm.",
+    "Instabilitate atmosferică accentuată, fenomene locale de furtună.",
+)
+# Numele culorilor exact ca în API (fără diacritice), cum le așteaptă SEVERITY_LEVELS
+_SEVERITIES = (("0", "galben"), ("1", "portocaliu"), ("2", "rosu"))
+
+
+def _entities(text: str) -> str:
+    """Encode non-ASCII characters as numeric entities, like the real feed."""
+    return text.encode("ascii", "xmlcharrefreplace").decode("ascii")
+
+
+def build_zona(rng: random.Random) -> str:
+    """Return a multi-county zona text with localities and <br> separators."""
+    counties = rng.sample(ROMANIAN_COUNTIES, rng.randint(1, 6))
+    segments = [
+        f"Județul {county}: {', '.join(rng.sample(_LOCALITIES, rng.randint(2, 8)))}"
+        for county in counties
+    ]
+    return ";<br>".join(segments) + ";<br>"
+
+
+def build_feed(size: int, seed: int = 0) -> bytes:
+    """Return a synthetic feed with `size` <avertizare> elements."""
+    rng = random.Random(seed)
+    now = dt_util.now().replace(second=0, microsecond=0, tzinfo=None)
+    lines = ['<?xml version="1.0" encoding="UTF-8"?>', "<avertizariNowcasting>"]
+    for index in range(size):
+        color, severity = rng.choice(_SEVERITIES)
+        start = now + timedelta(hours=rng.randint(-3, 3))
+        end = start + timedelta(hours=rng.randint(1, 12))
+        created = (start - timedelta(minutes=30)).strftime("%Y-%m-%d %H:%M:%S")
+        attributes = {
+            "tipMesaj": str(index % 3),
+            "numeTipMesaj": "Avertizare nowcasting" if color != "0" else "Atentionare nowcasting",
+            "dataInceput": start.strftime("%Y-%m-%dT%H:%M"),
+            "dataSfarsit": end.strftime("%Y-%m-%dT%H:%M"),
+            "zona": build_zona(rng),
+            "semnalare": rng.choice(_DESCRIPTIONS),
+            "culoare": color,
+            "numeCuloare": severity,
+            "modificat": created,
+            "creat": f"{created}.{index:03d}",
+        }
+        rendered = " ".join(
+            f"{name}={_entities(quoteattr(value))}" for name, value in attributes.items()
+        )
+        lines.append(f"  <avertizare {rendered}/>")
+    lines.append("</avertizariNowcasting>")
+    return "\n".join(lines).encode("ascii")
+
+
+def _chunked(payload: bytes) -> list[bytes]:
+    """Split a payload the way the coordinator reads it from the response."""
+    return [payload[i:i + _CHUNK_SIZE] for i in range(0, len(payload), _CHUNK_SIZE)]
+
+
+def _parse(chunks: list[bytes]) -> list[Alert]:
+    """Parse chunks the way the coordinator does."""
+    return parse_feed(chunks, dt_util.DEFAULT_TIME_ZONE)
+
+
+class _BenchView:
+    """Slicing half of the per-entry view, without Home Assistant plumbing."""
+
+    _slice = AlerteNowcastingView._slice
+    _expand = AlerteNowcastingView._expand
+    _index_by_county = staticmethod(AlerteNowcastingView._index_by_county)
+    _summarize = staticmethod(AlerteNowcastingView._summarize)
+
+    def __init__(self, counties: list[str]) -> None:
+        self.selected_counties = counties
+        self._selected_keys = county_keys(counties)
+        self.data: dict[str, Any] | None = None
+        self.generation = 0
+        self.changed_counties = None
+        self.last_update_success = True
+
+
+class _BenchHub:
+    """Download half of the shared coordinator, without Home Assistant plumbing."""
+
+    _async_request_source = AlerteNowcastingCoordinator._async_request_source
+
+    def __init__(self) -> None:
+        # None: prima descărcare, fără validatori condiționali și fără scurtcircuit
+        self.data: dict[str, Any] | None = None
+
+
+def _hub_data(alerts: list[Alert]) -> dict[str, Any]:
+    """Return the shared coordinator payload for parsed alerts."""
+    now = dt_util.now()
+    return {
+        "alerts": alerts,
+        "active_alerts": [
+            alert
+            for alert in alerts
+            if alert.start_time and alert.end_time and alert.start_time <= now < alert.end_time
+        ],
+        "last_update": dt_util.utcnow().isoformat(),
+        "stale_since": None,
+    }
+
+
+def measure(func: Callable[[], Any], repeat: int) -> dict[str, float]:
+    """Return median/min wall time (ms) and peak traced memory (KiB) of func."""
+    func()  # încălzire (cache-uri regex, lru_cache)
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - started) * 1000)
+
+    # Memoria se măsoară separat: tracemalloc încetinește execuția
+    gc.collect()
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return _summary(timings, peak)
+
+
+async def measure_async(func: Callable[[], Awaitable[Any]], repeat: int) -> dict[str, float]:
+    """Return median/min wall time (ms) and peak traced memory (KiB) of a coroutine."""
+    await func()
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        await func()
+        timings.append((time.perf_counter() - started) * 1000)
+
+    gc.collect()
+    tracemalloc.start()
+    await func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return _summary(timings, peak)
+
+
+def _summary(timings: list[float], peak: int) -> dict[str, float]:
+    """Return the reported figures for one benchmark."""
+    return {
+        "median_ms": statistics.median(timings),
+        "min_ms": min(timings),
+        "peak_kib": peak / 1024,
+    }
+
+
+def bench_parsing(repeat: int) -> dict[str, dict[str, float]]:
+    """Benchmark parse_feed and the per-alert helpers for every feed size."""
+    results = {}
+    for size in FEED_SIZES:
+        payload = build_feed(size)
+        chunks = _chunked(payload)
+        alerts = _parse(chunks)
+        zonas = [alert.zona for alert in alerts]
+        descriptions = [alert.description for alert in alerts]
+
+        results[f"parse_xml[{size}]"] = measure(lambda: _parse(chunks), repeat)
+        results[f"extract_counties[{size}]"] = measure(
+            lambda: [extract_counties(zona) for zona in zonas], repeat
+        )
+        results[f"detect_phenomena[{size}]"] = measure(
+            lambda: [detect_phenomena(text) for text in descriptions], repeat
+        )
+    return results
+
+
+def bench_sensors(repeat: int, feed_size: int) -> dict[str, dict[str, float]]:
+    """Benchmark slicing plus attribute generation for 1 to 42 county sensors."""
+    alerts = _parse(_chunked(build_feed(feed_size)))
+    hub_data = _hub_data(alerts)
+    entry = SimpleNamespace(entry_id="bench")
+    results = {}
+    for count in SENSOR_COUNTS:
+        view = _BenchView(ROMANIAN_COUNTIES[:count])
+        sensors = [AlerteNowcastingSensor(view, entry, county) for county in view.selected_counties]
+
+        def refresh() -> None:
+            # O generație nouă la fiecare rulare: fiecare senzor își reconstruiește atributele
+            view.data = None
+            view.data = view._slice(hub_data)
+            for sensor in sensors:
+                sensor.native_value
+                sensor.extra_state_attributes
+                sensor.icon
+
+        results[f"sensors[{count}]"] = measure(refresh, repeat)
+    return results
+
+
+async def bench_endpoint(repeat: int) -> dict[str, dict[str, float]]:
+    """Benchmark the coordinator download + parse against a local stand-in feed endpoint."""
+    feeds = {size: build_feed(size) for size in FEED_SIZES}
+    html_page = b"<!DOCTYPE html><html><body>" + b"Eroare " * 2000 + b"</body></html>"
+
+    async def handle_feed(request: web.Request) -> web.Response:
+        payload = feeds[int(request.match_info["size"])]
+        etag = f'"{hashlib.blake2b(payload, digest_size=8).hexdigest()}"'
+        if request.headers.get(hdrs.IF_NONE_MATCH) == etag:
+            return web.Response(status=304, headers={hdrs.ETAG: etag})
+        return web.Response(body=payload, content_type="text/xml", headers={hdrs.ETAG: etag})
+
+    async def handle_html(request: web.Request) -> web.Response:
+        # Pagină de eroare servită cu 200
+        return web.Response(body=html_page, content_type="text/html")
+
+    async def handle_oversize(request: web.Request) -> web.StreamResponse:
+        # Fără Content-Length: limita trebuie aplicată în timpul citirii
+        response = web.StreamResponse(headers={hdrs.CONTENT_TYPE: "text/xml"})
+        response.enable_chunked_encoding()
+        await response.prepare(request)
+        block = b"<avertizariNowcasting>" + b" " * (_CHUNK_SIZE - 22)
+        try:
+            for _ in range(MAX_PAYLOAD_SIZE // len(block) + 2):
+                await response.write(block)
+        except ConnectionResetError:
+            pass
+        return response
+
+    app = web.Application()
+    app.router.add_get("/avertizari-nowcasting-xml/{size}", handle_feed)
+    app.router.add_get("/html", handle_html)
+    app.router.add_get("/oversize", handle_oversize)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    base = f"http://127.0.0.1:{runner.addresses[0][1]}"
+
+    cold = _BenchHub()
+    warm = _BenchHub()
+    warm.data = {}
+
+    async def rejected(session: ClientSession, url: str) -> None:
+        try:
+            await cold._async_request_source(session, FeedSource(url))
+        except UpdateFailed:
+            return
+        raise AssertionError(f"{url} was not rejected")
+
+    results = {}
+    try:
+        async with ClientSession() as session:
+            for size in FEED_SIZES:
+                url = f"{base}/avertizari-nowcasting-xml/{size}"
+
+                async def fetch() -> list[Alert]:
+                    fetched = await cold._async_request_source(session, FeedSource(url))
+                    return _parse(fetched[1])
+
+                results[f"endpoint[{size}]"] = await measure_async(fetch, repeat)
+
+                # Sursă cu validatorii și amprenta ultimului răspuns
+                known = FeedSource(url)
+                known.fingerprint = (await cold._async_request_source(session, known))[0]
+                etag = known.etag
+
+                async def not_modified() -> None:
+                    known.etag = etag
+                    assert await warm._async_request_source(session, known) is None
+
+                async def unchanged() -> None:
+                    # Fără ETag trimis: corpul este descărcat, dar parsarea este sărită
+                    known.etag = None
+                    assert await warm._async_request_source(session, known) is None
+
+                results[f"endpoint_304[{size}]"] = await measure_async(not_modified, repeat)
+                results[f"endpoint_same[{size}]"] = await measure_async(unchanged, repeat)
+
+            results["endpoint_html"] = await measure_async(
+                lambda: rejected(session, f"{base}/html"), repeat
+            )
+            results["endpoint_oversize"] = await measure_async(
+                lambda: rejected(session, f"{base}/oversize"), repeat
+            )
+    finally:
+        await runner.cleanup()
+    return results
+
+
+def compare(results: dict[str, dict[str, float]], baseline_path: Path, threshold: float) -> list[str]:
+    """Return the benchmarks whose median time or peak memory regressed past the threshold."""
+    baseline = json.loads(baseline_path.read_text(encoding="utf-8"))
+    regressions = []
+    for name, current in results.items():
+        if (previous := baseline.get(name)) is None:
+            continue
+        for metric in ("median_ms", "peak_kib"):
+            # Ignorăm valorile foarte mici, dominate de zgomot
+            if previous[metric] >= 0.05 and current[metric] > previous[metric] * threshold:
+                regressions.append(
+                    f"{name} {metric}: {previous[metric]:.2f} -> {current[metric]:.2f}"
+                )
+    return regressions
+
+
+def main() -> int:
+    """Run the benchmarks and print a results table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20, help="timed runs per benchmark")
+    parser.add_argument("--sensor-feed-size", type=int, default=100, help="alerts in the sensor benchmark feed")
+    parser.add_argument("--save", type=Path, help="write results as JSON (baseline)")
+    parser.add_argument("--compare", type=Path, help="baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=1.25, help="allowed slowdown factor")
+    args = parser.parse_args()
+
+    dt_util.set_default_time_zone(dt_util.get_time_zone("Europe/Bucharest"))
+
+    results = bench_parsing(args.repeat)
+    results.update(bench_sensors(args.repeat, args.sensor_feed_size))
+    results.update(asyncio.run(bench_endpoint(args.repeat)))
+
+    print(f"{'benchmark':<28}{'median ms':>12}{'min ms':>12}{'peak KiB':>12}")
+    for name, result in results.items():
+        print(
+            f"{name:<28}{result['median_ms']:>12.3f}{result['min_ms']:>12.3f}{result['peak_kib']:>12.1f}"
+        )
+
+    if args.save:
+        args.save.write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+    if args.compare:
+        if regressions := compare(results, args.compare, args.threshold):
+            print("\nRegressions:")
+            print("\n".join(f"  {line}" for line in regressions))
+            return 1
+        print("\nNo regressions.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,37 +6,155 @@ import logging
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import ConfigEntryNotReady
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.typing import ConfigType
 
-from .const import DOMAIN
+from .const import (
+    DOMAIN,
+    CONF_API_URL,
+    CONF_COMPACT_ATTRIBUTES,
+    CONF_COUNTIES,
+    CONF_INCLUDE_WARNINGS,
+    CONF_MAX_SCAN_INTERVAL,
+    CONF_MIN_SCAN_INTERVAL,
+    CONF_STALE_WINDOW,
+    DEFAULT_MAX_SCAN_INTERVAL,
+    DEFAULT_MIN_SCAN_INTERVAL,
+    DEFAULT_STALE_WINDOW,
+    SIGNAL_COUNTIES_UPDATED,
+    WARNINGS_API_URL,
+)
+from .coordinator import (
+    AlerteNowcastingCoordinator,
+    AlerteNowcastingView,
+    async_get_hub,
+    async_release_hub,
+    async_remove_store,
+)
+from .services import async_setup_services
 
 _LOGGER = logging.getLogger(__name__)
 
 PLATFORMS: list[Platform] = [Platform.SENSOR]
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the Alerte Nowcasting services."""
+    async_setup_services(hass)
+    return True
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Alerte Nowcasting from a config entry."""
     hass.data.setdefault(DOMAIN, {})
-    
+
+    # Un singur coordinator per set de surse, partajat de toate intrările care îl folosesc
+    hub = async_get_hub(hass, _get_sources(entry))
+    _async_subscribe(hub, entry)
+
+    if hub.data is None:
+        if await hub.async_restore():
+            # Senzorii pornesc din snapshot; datele proaspete vin în fundal
+            entry.async_create_background_task(
+                hass, hub.async_request_refresh(), f"{DOMAIN}_refresh_{entry.entry_id}"
+            )
+        else:
+            await hub.async_refresh()
+            if not hub.last_update_success:
+                await async_release_hub(hass, hub, entry.entry_id)
+                raise ConfigEntryNotReady(str(hub.last_exception)) from hub.last_exception
+
+    view = AlerteNowcastingView(hass, hub, entry.entry_id)
+    view.compact_attributes = entry.options.get(CONF_COMPACT_ATTRIBUTES, False)
+    view.async_set_selection(_get_selected_counties(entry))
+    view.async_start()
+    hass.data[DOMAIN][entry.entry_id] = view
+
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
-    
+
     # Adaug listener pentru schimbări de opțiuni
     entry.async_on_unload(entry.add_update_listener(_async_options_update_listener))
-    
+
     return True
 
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
-    
+
     if unload_ok:
-        hass.data[DOMAIN].pop(entry.entry_id, None)
-    
+        view: AlerteNowcastingView = hass.data[DOMAIN].pop(entry.entry_id)
+        await view.async_shutdown()
+        await async_release_hub(hass, view.hub, entry.entry_id)
+
     return unload_ok
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Delete the feed snapshot of a removed entry when no other entry uses its sources."""
+    await _async_remove_unused_store(hass, _get_sources(entry), entry.entry_id)
+
+
+async def _async_remove_unused_store(
+    hass: HomeAssistant, sources: tuple[str, ...], entry_id: str
+) -> None:
+    """Delete the snapshot of a set of sources unless another entry is configured with them."""
+    if any(
+        _get_sources(other) == sources
+        for other in hass.config_entries.async_entries(DOMAIN)
+        if other.entry_id != entry_id
+    ):
+        return
+    _LOGGER.debug("Removing the feed snapshot of %s", ", ".join(sources))
+    await async_remove_store(hass, sources)
+
+
 async def _async_options_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
-    """Ascultă schimbări de opțiuni și reînnodește entry-ul."""
-    _LOGGER.info("Options changed, reloading integration for entry %s", entry.entry_id)
-    await hass.config_entries.async_reload(entry.entry_id)
+    """Ascultă schimbări de opțiuni și reaplică selecția pe datele deja descărcate."""
+    _LOGGER.info("Options changed, re-slicing cached data for entry %s", entry.entry_id)
+    view: AlerteNowcastingView = hass.data[DOMAIN][entry.entry_id]
+    if (
+        view.hub.urls != _get_sources(entry)
+        or view.compact_attributes != entry.options.get(CONF_COMPACT_ATTRIBUTES, False)
+    ):
+        # Alt set de surse înseamnă alt coordinator partajat, iar modul compact schimbă
+        # clasa senzorilor: reîncărcăm intrarea
+        old_sources = view.hub.urls
+        await hass.config_entries.async_reload(entry.entry_id)
+        if old_sources != _get_sources(entry):
+            await _async_remove_unused_store(hass, old_sources, entry.entry_id)
+        return
+    _async_subscribe(view.hub, entry)
+    view.async_set_selection(_get_selected_counties(entry))
+
+    # Senzorii pentru județele adăugate/eliminate sunt gestionați de platforma sensor
+    async_dispatcher_send(hass, SIGNAL_COUNTIES_UPDATED.format(entry.entry_id))
+
+
+@callback
+def _async_subscribe(hub: AlerteNowcastingCoordinator, entry: ConfigEntry) -> None:
+    """Register the entry's counties, polling bounds and stale window with the shared coordinator."""
+    hub.async_subscribe(
+        entry.entry_id,
+        _get_selected_counties(entry),
+        entry.options.get(CONF_MIN_SCAN_INTERVAL, DEFAULT_MIN_SCAN_INTERVAL),
+        entry.options.get(CONF_MAX_SCAN_INTERVAL, DEFAULT_MAX_SCAN_INTERVAL),
+        entry.options.get(CONF_STALE_WINDOW, DEFAULT_STALE_WINDOW),
+    )
+
+
+def _get_sources(entry: ConfigEntry) -> tuple[str, ...]:
+    """Return the feed URLs of an entry: the configured feed plus the optional warnings feed."""
+    sources = (entry.data[CONF_API_URL],)
+    if entry.options.get(CONF_INCLUDE_WARNINGS) and WARNINGS_API_URL not in sources:
+        sources += (WARNINGS_API_URL,)
+    return sources
+
+
+def _get_selected_counties(entry: ConfigEntry) -> list[str]:
+    """Citesc județele din opțiuni (dacă există) sau din config data."""
+    return entry.options.get(CONF_COUNTIES) or entry.data.get(CONF_COUNTIES, [])
@@ -14,12 +14,22 @@ from homeassistant.core import HomeAssistant
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
 from .const import (
     DOMAIN,
     CONF_API_URL,
+    CONF_COMPACT_ATTRIBUTES,
     CONF_COUNTIES,
+    CONF_INCLUDE_WARNINGS,
+    CONF_MAX_SCAN_INTERVAL,
+    CONF_MIN_SCAN_INTERVAL,
+    CONF_STALE_WINDOW,
     DEFAULT_API_URL,
+    DEFAULT_MAX_SCAN_INTERVAL,
+    DEFAULT_MIN_SCAN_INTERVAL,
+    DEFAULT_STALE_WINDOW,
+    MAX_PAYLOAD_SIZE,
     DEFAULT_NAME,
     ROMANIAN_COUNTIES,
 )
@@ -39,26 +49,32 @@ STEP_USER_DATA_SCHEMA = vol.Schema(
 async def validate_input(hass: HomeAssistant, data: dict[str, Any]) -> dict[str, Any]:
     """Validate the user input allows us to connect."""
     api_url = data[CONF_API_URL]
+    # Aceeași sesiune partajată folosită și de coordinator
+    session = async_get_clientsession(hass)
     
     try:
         async with asyncio.timeout(10):
-            async with aiohttp.ClientSession() as session:
-                async with session.get(api_url) as response:
-                    if response.status != 200:
-                        raise CannotConnect(f"HTTP {response.status}")
-                    
-                    xml_data = await response.text()
-                    # Verifică dacă XML-ul este valid (poate fi gol, e ok)
-                    try:
-                        root = ET.fromstring(xml_data)
-                        # XML-ul este valid, chiar dacă nu conține alerte
-                        _LOGGER.debug(
-                            "API connection successful. Root element: %s, children: %d",
-                            root.tag,
-                            len(list(root))
-                        )
-                    except ET.ParseError as err:
-                        raise InvalidXML(f"Invalid XML: {err}") from err
+            async with session.get(api_url) as response:
+                if response.status != 200:
+                    raise CannotConnect(f"HTTP {response.status}")
+                
+                # Octeți bruți, cu limită de dimensiune; encoding-ul vine din declarația XML
+                xml_data = bytearray()
+                async for chunk in response.content.iter_chunked(64 * 1024):
+                    xml_data += chunk
+                    if len(xml_data) > MAX_PAYLOAD_SIZE:
+                        raise InvalidXML(f"Response exceeds {MAX_PAYLOAD_SIZE} bytes")
+                # Verifică dacă XML-ul este valid (poate fi gol, e ok)
+                try:
+                    root = ET.fromstring(bytes(xml_data))
+                    # XML-ul este valid, chiar dacă nu conține alerte
+                    _LOGGER.debug(
+                        "API connection successful. Root element: %s, children: %d",
+                        root.tag,
+                        len(list(root))
+                    )
+                except ET.ParseError as err:
+                    raise InvalidXML(f"Invalid XML: {err}") from err
                     
     except aiohttp.ClientError as err:
         raise CannotConnect(f"Connection error: {err}") from err
@@ -83,16 +99,19 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     ) -> FlowResult:
         """Handle the initial step - Selectare județe."""
         if user_input is not None:
-            # Verifica unicitate basata pe URL (constant)
-            await self.async_set_unique_id(DEFAULT_API_URL)
-            self._abort_if_unique_id_configured()
+            counties = sorted(user_input.get(CONF_COUNTIES, []))
+            # Mai multe intrări pe același URL (partajează coordinatorul), dar nu două
+            # cu aceeași selecție de județe. Selecția se poate schimba din opțiuni, deci
+            # nu face parte din unique_id: se compară cu selecția curentă a intrărilor.
+            if _selection_in_use(self._async_current_entries(), counties):
+                return self.async_abort(reason="already_configured")
             
             # Creaza entry cu URL default și județele selectate
             config_data = {
                 CONF_API_URL: DEFAULT_API_URL,
-                CONF_COUNTIES: user_input.get(CONF_COUNTIES, []),
+                CONF_COUNTIES: counties,
             }
-            return self.async_create_entry(title="Alerte Nowcasting", data=config_data)
+            return self.async_create_entry(title=_entry_title(counties), data=config_data)
         
         return self.async_show_form(
             step_id="user",
@@ -110,9 +129,26 @@ class OptionsFlow(config_entries.OptionsFlow):
     
     async def async_step_init(self, user_input=None):
         """Handle options step."""
+        errors = {}
         if user_input is not None:
-            # Returnează doar data, fără title (standard pentru OptionsFlow)
-            return self.async_create_entry(data=user_input)
+            counties = sorted(user_input.get(CONF_COUNTIES, []))
+            others = [
+                entry
+                for entry in self.hass.config_entries.async_entries(DOMAIN)
+                if entry.entry_id != self.config_entry.entry_id
+            ]
+            if user_input[CONF_MIN_SCAN_INTERVAL] > user_input[CONF_MAX_SCAN_INTERVAL]:
+                errors["base"] = "invalid_scan_interval"
+            elif _selection_in_use(others, counties):
+                errors["base"] = "already_configured"
+            else:
+                # Titlul generat urmează selecția; un titlu redenumit de utilizator rămâne
+                if self.config_entry.title == _entry_title(_entry_counties(self.config_entry)):
+                    self.hass.config_entries.async_update_entry(
+                        self.config_entry, title=_entry_title(counties)
+                    )
+                # Returnează doar data, fără title (standard pentru OptionsFlow)
+                return self.async_create_entry(data=user_input)
         
         # Preiau județele curente din opțiuni sau din data
         current_counties = self.config_entry.options.get(
@@ -128,15 +164,57 @@ class OptionsFlow(config_entries.OptionsFlow):
                 ): cv.multi_select(
                     {county: county for county in sorted(ROMANIAN_COUNTIES)}
                 ),
+                vol.Optional(
+                    CONF_MIN_SCAN_INTERVAL,
+                    default=self.config_entry.options.get(
+                        CONF_MIN_SCAN_INTERVAL, DEFAULT_MIN_SCAN_INTERVAL
+                    ),
+                ): vol.All(vol.Coerce(int), vol.Range(min=30, max=3600)),
+                vol.Optional(
+                    CONF_MAX_SCAN_INTERVAL,
+                    default=self.config_entry.options.get(
+                        CONF_MAX_SCAN_INTERVAL, DEFAULT_MAX_SCAN_INTERVAL
+                    ),
+                ): vol.All(vol.Coerce(int), vol.Range(min=60, max=86400)),
+                vol.Optional(
+                    CONF_STALE_WINDOW,
+                    default=self.config_entry.options.get(
+                        CONF_STALE_WINDOW, DEFAULT_STALE_WINDOW
+                    ),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=86400)),
+                vol.Optional(
+                    CONF_INCLUDE_WARNINGS,
+                    default=self.config_entry.options.get(CONF_INCLUDE_WARNINGS, False),
+                ): bool,
+                vol.Optional(
+                    CONF_COMPACT_ATTRIBUTES,
+                    default=self.config_entry.options.get(CONF_COMPACT_ATTRIBUTES, False),
+                ): bool,
             }
         )
         
         return self.async_show_form(
             step_id="init",
             data_schema=options_schema,
+            errors=errors,
         )
 
 
+def _entry_counties(entry: config_entries.ConfigEntry) -> list[str]:
+    """Return the counties currently selected by an entry (options first, then data)."""
+    return sorted(entry.options.get(CONF_COUNTIES) or entry.data.get(CONF_COUNTIES, []))
+
+
+def _selection_in_use(entries: list[config_entries.ConfigEntry], counties: list[str]) -> bool:
+    """Return True if one of the entries already monitors exactly these counties."""
+    return any(_entry_counties(entry) == counties for entry in entries)
+
+
+def _entry_title(counties: list[str]) -> str:
+    """Return the generated title of an entry for a county selection."""
+    return f"Alerte Nowcasting ({', '.join(counties)})" if counties else "Alerte Nowcasting"
+
+
 class CannotConnect(HomeAssistantError):
     """Error to indicate we cannot connect."""
 
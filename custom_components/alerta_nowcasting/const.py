@@ -6,10 +6,48 @@ NAME = "Alerte Nowcasting Meteo"
 # Configuration
 CONF_API_URL = "api_url"
 CONF_COUNTIES = "counties"
+CONF_MIN_SCAN_INTERVAL = "min_scan_interval"
+CONF_MAX_SCAN_INTERVAL = "max_scan_interval"
+CONF_INCLUDE_WARNINGS = "include_warnings"
+CONF_STALE_WINDOW = "stale_window"
+CONF_COMPACT_ATTRIBUTES = "compact_attributes"
 DEFAULT_API_URL = "https://www.meteoromania.ro/avertizari-nowcasting-xml.php"
+# Avertizările generale ANM, sursă suplimentară opțională. Se parsează cu parserul
+# nowcasting; avertizările fără atributul zona sunt ignorate (vezi _merge_sources)
+WARNINGS_API_URL = "https://www.meteoromania.ro/avertizari-xml.php"
+
+# Evenimente pe bus-ul Home Assistant la schimbarea alertelor
+EVENT_ALERT_NEW = f"{DOMAIN}_alert_new"
+EVENT_ALERT_UPDATED = f"{DOMAIN}_alert_updated"
+EVENT_ALERT_EXPIRED = f"{DOMAIN}_alert_expired"
+
+# Serviciu care întoarce textul complet al alertelor (util în modul compact)
+SERVICE_GET_ALERT_DETAILS = "get_alert_details"
+ATTR_ALERT_ID = "alert_id"
+ATTR_COUNTY = "county"
+
+# Atributele mari (text HTML) excluse din istoricul recorder-ului în modul compact
+UNRECORDED_ATTRIBUTES = frozenset({"semnalare", "Zone"})
+
+# Semnal dispatcher trimis când se schimbă județele unei intrări (format cu entry_id)
+SIGNAL_COUNTIES_UPDATED = f"{DOMAIN}_counties_updated_{{}}"
+# Semnal trimis după fiecare ciclu al unui coordinator partajat (format cu id-ul lui),
+# chiar și când datele nu s-au schimbat: timpii de actualizare se schimbă mereu
+SIGNAL_TIMINGS_UPDATED = f"{DOMAIN}_timings_updated_{{}}"
+
+# Dimensiunea maximă acceptată a unui răspuns de la API (feed-ul real are zeci de KiB)
+MAX_PAYLOAD_SIZE = 4 * 1024 * 1024
+
+# Snapshot persistent al ultimului feed parsat (helper Store, câte unul per URL)
+STORAGE_VERSION = 1
+STORAGE_KEY = f"{DOMAIN}.feed_{{}}"
+STORAGE_SAVE_DELAY = 10  # secunde
 
 # Defaults
 DEFAULT_SCAN_INTERVAL = 300  # 5 minute
+DEFAULT_MIN_SCAN_INTERVAL = 60  # 1 minut (alerte portocalii/roșii active)
+DEFAULT_MAX_SCAN_INTERVAL = 1800  # 30 minute (perioade lungi fără schimbări)
+DEFAULT_STALE_WINDOW = 3600  # 1 oră cu ultimele date bune când API-ul nu răspunde
 DEFAULT_NAME = "Alerta Nowcasting"
 
 # Atribute senzor
@@ -44,6 +82,13 @@ SEVERITY_LEVELS = {
     "rosu": "red",
 }
 
+# Denumiri afișate în atribute pentru culorile din API
+SEVERITY_DISPLAY = {
+    "galben": "galben",
+    "portocaliu": "portocaliu",
+    "rosu": "roșu",
+}
+
 # Mapare coduri culoare din API
 COLOR_CODES = {
     "0": "galben",
@@ -58,6 +103,21 @@ MESSAGE_TYPES = {
     "3": "Informare nowcasting",
 }
 
+# Denumiri afișate în atribute pentru fenomene
+PHENOMENA_DISPLAY = {
+    "ceata": "ceață",
+    "polei": "polei",
+    "ninsoare": "ninsoare",
+    "viscol": "viscol",
+    "ploi_torentiale": "ploi torențiale",
+    "grindina": "grindină",
+    "vijelie": "vijelie",
+    "fulger": "fulgere",
+    "vant_puternic": "vânt puternic",
+    "instabilitate": "instabilitate",
+    "default": "-",
+}
+
 # Iconițe pentru diferite fenomene
 PHENOMENA_ICONS = {
     "ceata": "mdi:weather-fog",
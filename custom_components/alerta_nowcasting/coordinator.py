@@ -0,0 +1,896 @@
+"""Data coordinators for Alerte Nowcasting integration."""
+from __future__ import annotations
+
+import asyncio
+import bisect
+import hashlib
+import logging
+import random
+import time
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any
+
+import aiohttp
+from aiohttp import hdrs
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.event import async_track_point_in_utc_time
+from homeassistant.helpers.storage import Store
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    DOMAIN,
+    DEFAULT_MAX_SCAN_INTERVAL,
+    DEFAULT_MIN_SCAN_INTERVAL,
+    DEFAULT_SCAN_INTERVAL,
+    DEFAULT_STALE_WINDOW,
+    EVENT_ALERT_EXPIRED,
+    EVENT_ALERT_NEW,
+    EVENT_ALERT_UPDATED,
+    MAX_PAYLOAD_SIZE,
+    SIGNAL_TIMINGS_UPDATED,
+    STORAGE_KEY,
+    STORAGE_SAVE_DELAY,
+    STORAGE_VERSION,
+)
+from .models import Alert, AlertSummary, CountyAlert
+from .parser import county_key, county_keys, looks_like_html, parse_alert, parse_feed
+from .stats import StageTimings
+
+_LOGGER = logging.getLogger(__name__)
+
+# Cheie în hass.data[DOMAIN] pentru coordinatoarele partajate (URL-uri -> coordinator)
+DATA_HUBS = "hubs"
+
+# Timeout per încercare; sursele sunt descărcate în paralel, deci o sursă lentă nu
+# întârzie celelalte surse
+_SOURCE_TIMEOUT = 20
+
+# Reîncercări în cadrul aceluiași ciclu pentru erori tranzitorii (rețea, timeout,
+# 429/5xx): pauzele dintre încercări, în secunde, înainte de jitter
+_RETRY_DELAYS = (1, 3)
+
+# Circuit breaker per sursă: după atâtea cicluri eșuate consecutiv sursa nu mai
+# este contactată o perioadă, care se dublează la fiecare nouă eșuare
+_BREAKER_THRESHOLD = 3
+_BREAKER_COOLDOWN = 5 * 60
+_BREAKER_MAX_COOLDOWN = 60 * 60
+
+# Dimensiunea bucăților citite din răspunsul HTTP și trimise parserului incremental
+_CHUNK_SIZE = 16 * 1024
+
+# Payload-urile mai mari de atât sunt parsate într-un executor, nu în event loop
+_EXECUTOR_PARSE_THRESHOLD = 32 * 1024
+
+# Politica de polling adaptiv
+_FAST_POLL_SEVERITIES = frozenset({"portocaliu", "rosu"})
+_RECENT_CHANGE_WINDOW = 15 * 60  # secunde după o schimbare în care păstrăm polling rapid
+_QUIET_CYCLES_PER_STEP = 6  # după câte cicluri fără schimbări se dublează intervalul
+_POLL_JITTER = 0.1  # ±10%
+
+
+@dataclass(slots=True)
+class FeedSource:
+    """Fetch state of one feed URL aggregated by the shared coordinator."""
+
+    url: str
+    # Validatori HTTP pentru cereri condiționate (ETag / Last-Modified)
+    etag: str | None = None
+    last_modified: str | None = None
+    # Amprenta ultimului payload parsat și alertele rezultate din el
+    fingerprint: str | None = None
+    alerts: list[Alert] = field(default_factory=list)
+    # Ultima eroare (None dacă ultima cerere a reușit) și măsurătorile ultimei cereri
+    last_error: str | None = None
+    connect_ms: float | None = None
+    download_ms: float | None = None
+    download_bytes: int | None = None
+    # Circuit breaker: cicluri eșuate consecutiv și momentul (monotonic) redeschiderii
+    failures: int = 0
+    open_until: float | None = None
+
+    @property
+    def half_open(self) -> bool:
+        """Return True when the next request is a single trial after the breaker opened."""
+        return self.failures >= _BREAKER_THRESHOLD
+
+    def is_open(self) -> bool:
+        """Return True while the breaker blocks requests to this source."""
+        return self.open_until is not None and time.monotonic() < self.open_until
+
+    def record_success(self) -> None:
+        """Close the breaker after a successful cycle."""
+        self.failures = 0
+        self.open_until = None
+        self.last_error = None
+
+    def record_failure(self, err: Exception) -> None:
+        """Count a failed cycle and open the breaker once the threshold is reached."""
+        self.failures += 1
+        self.last_error = str(err)
+        if self.failures >= _BREAKER_THRESHOLD:
+            cooldown = min(
+                _BREAKER_COOLDOWN * 2 ** (self.failures - _BREAKER_THRESHOLD),
+                _BREAKER_MAX_COOLDOWN,
+            )
+            self.open_until = time.monotonic() + cooldown
+            _LOGGER.warning(
+                "Feed %s failed %d times in a row, pausing requests for %d s: %s",
+                self.url,
+                self.failures,
+                cooldown,
+                err,
+            )
+
+
+class _TransientError(UpdateFailed):
+    """Error that may go away when the request is retried."""
+
+
+@callback
+def async_get_hub(hass: HomeAssistant, urls: tuple[str, ...]) -> AlerteNowcastingCoordinator:
+    """Return the shared coordinator for a set of feed URLs, creating it if needed."""
+    hubs: dict[tuple[str, ...], AlerteNowcastingCoordinator] = hass.data[DOMAIN].setdefault(
+        DATA_HUBS, {}
+    )
+    if (hub := hubs.get(urls)) is None:
+        hub = hubs[urls] = AlerteNowcastingCoordinator(hass, urls)
+    return hub
+
+
+async def async_release_hub(hass: HomeAssistant, hub: AlerteNowcastingCoordinator, entry_id: str) -> None:
+    """Drop a config entry from a shared coordinator, shutting it down when unused."""
+    if hub.async_unsubscribe(entry_id):
+        hass.data[DOMAIN][DATA_HUBS].pop(hub.urls, None)
+        await hub.async_shutdown()
+
+
+async def async_remove_store(hass: HomeAssistant, urls: tuple[str, ...]) -> None:
+    """Delete the persisted snapshot of a set of feed URLs."""
+    await Store(hass, STORAGE_VERSION, STORAGE_KEY.format(_hub_id(urls))).async_remove()
+
+
+def _hub_id(urls: tuple[str, ...]) -> str:
+    """Return the id of the shared coordinator for a set of feed URLs."""
+    # Pentru o singură sursă id-ul rămâne cel bazat doar pe URL-ul ei
+    return hashlib.sha1("|".join(urls).encode()).hexdigest()[:12]
+
+
+class AlerteNowcastingCoordinator(DataUpdateCoordinator):
+    """Class to fetch, parse and merge one or more feed URLs, shared by all entries using them."""
+
+    def __init__(self, hass: HomeAssistant, urls: tuple[str, ...]) -> None:
+        """Initialize."""
+        self.urls = urls
+        # Prima sursă este feed-ul principal; alertele ei au prioritate la deduplicare
+        self.sources = {url: FeedSource(url) for url in urls}
+        # entry_id -> (chei județe selectate, interval minim, interval maxim, fereastră date vechi)
+        self._subscribers: dict[str, tuple[frozenset[str], int, int, int]] = {}
+        # Județele urmărite de cel puțin o intrare; None înseamnă toată țara
+        self._watched_keys: frozenset[str] | None = None
+        # Alertele tuturor surselor, combinate și deduplicate
+        self._parsed_alerts: list[Alert] = []
+        # Momentele (sortate) în care o alertă începe sau se termină
+        self._boundaries: list[datetime] = []
+        self._unsub_transition: CALLBACK_TYPE | None = None
+        # Stare pentru polling adaptiv (limitele vin de la intrările abonate)
+        self._min_interval = DEFAULT_MIN_SCAN_INTERVAL
+        self._max_interval = DEFAULT_MAX_SCAN_INTERVAL
+        self._base_interval = DEFAULT_SCAN_INTERVAL
+        self._quiet_cycles = 0
+        self._failures = 0
+        self._last_change: float | None = None
+        hub_id = _hub_id(urls)
+        # Snapshot persistent pentru pornire rapidă (fără a aștepta API-ul)
+        self._store: Store[dict[str, Any]] = Store(hass, STORAGE_VERSION, STORAGE_KEY.format(hub_id))
+        self.signal_timings = SIGNAL_TIMINGS_UPDATED.format(hub_id)
+        self._fetched_at: str | None = None
+        # Servire date vechi: ultimul ciclu reușit și, cât timp sursele eșuează, de când
+        self._last_success: datetime | None = None
+        self._stale_since: datetime | None = None
+        self._stale_window = DEFAULT_STALE_WINDOW
+        # Durate și dimensiuni pe etape pentru ultimele cicluri (senzori de diagnostic)
+        self.timings = StageTimings()
+        super().__init__(
+            hass,
+            _LOGGER,
+            name=DOMAIN,
+            update_interval=timedelta(seconds=self._base_interval),
+            # Senzorii nu sunt notificați când datele sunt identice cu cele anterioare
+            always_update=False,
+        )
+
+    async def _async_update_data(self) -> dict[str, Any]:
+        """Fetch data from API and adapt the polling interval to the outcome."""
+        try:
+            return await self._async_update_feed()
+        finally:
+            # Programat după notificarea vederilor (filtrare și notificare senzori), ca
+            # senzorii de timpi să fie scriși la fiecare ciclu, inclusiv fără date noi
+            self.hass.loop.call_soon(async_dispatcher_send, self.hass, self.signal_timings)
+
+    async def _async_update_feed(self) -> dict[str, Any]:
+        """Fetch, parse and merge the sources, serving stale data on failure."""
+        try:
+            data = await self._async_fetch_data()
+        except UpdateFailed as err:
+            self._failures += 1
+            self._adapt_update_interval()
+            if (data := self._serve_stale(err)) is None:
+                raise
+            return data
+        
+        self._failures = 0
+        self._last_success = dt_util.utcnow()
+        if data is self.data:
+            self._quiet_cycles += 1
+        elif self.data is not None:
+            # Prima încărcare nu contează ca schimbare a feed-ului
+            self._quiet_cycles = 0
+            self._last_change = time.monotonic()
+        self._adapt_update_interval(data)
+        
+        if self._stale_since is not None:
+            _LOGGER.info("Feed recovered, data is fresh again")
+            self._stale_since = None
+            # Schimbarea indicatorului de date vechi trebuie să ajungă la senzori
+            data = self._build_data(self._parsed_alerts)
+        return data
+
+    def _serve_stale(self, err: UpdateFailed) -> dict[str, Any] | None:
+        """Return the last good data, marked stale, while within the stale window."""
+        if self.data is None or self._last_success is None:
+            return None
+        if dt_util.utcnow() - self._last_success > timedelta(seconds=self._stale_window):
+            return None
+        if self._stale_since is None:
+            _LOGGER.warning(
+                "Update failed, serving data from %s for up to %d s: %s",
+                self._last_success.isoformat(),
+                self._stale_window,
+                err,
+            )
+            self._stale_since = dt_util.utcnow()
+        # Alertele active sunt recalculate, dar din ultimele date bune
+        return self._build_data(self._parsed_alerts)
+
+    def _adapt_update_interval(self, data: dict[str, Any] | None = None) -> None:
+        """Pick the next polling interval based on alert state and feed change rate.
+
+        Poll at the minimum interval while an orange/red alert is active or the feed
+        changed recently, back off exponentially after failures and during long quiet
+        periods, and always add some jitter.
+        """
+        if self._failures:
+            seconds = self._min_interval * 2 ** min(self._failures, 10)
+        elif (
+            data is not None
+            and any(
+                alert.severity in _FAST_POLL_SEVERITIES and self._is_watched(alert)
+                for alert in data["active_alerts"]
+            )
+        ) or (
+            self._last_change is not None
+            and time.monotonic() - self._last_change < _RECENT_CHANGE_WINDOW
+        ):
+            seconds = self._min_interval
+        else:
+            seconds = self._base_interval * 2 ** min(self._quiet_cycles // _QUIET_CYCLES_PER_STEP, 10)
+        
+        seconds = min(max(seconds, self._min_interval), self._max_interval)
+        seconds *= random.uniform(1 - _POLL_JITTER, 1 + _POLL_JITTER)
+        self.update_interval = timedelta(seconds=seconds)
+        _LOGGER.debug("Next poll in %.0f s", seconds)
+
+    async def _async_fetch_data(self) -> dict[str, Any]:
+        """Fetch all sources concurrently, parse the changed ones and merge the alerts."""
+        # Sesiunea partajată a Home Assistant păstrează conexiunile deschise între cicluri
+        session = async_get_clientsession(self.hass)
+        sources = list(self.sources.values())
+        results = await asyncio.gather(
+            *(self._async_fetch_source(session, source) for source in sources),
+            return_exceptions=True,
+        )
+        
+        payloads: list[tuple[FeedSource, str, list[bytes], int]] = []
+        failed: dict[str, Exception] = {}
+        for source, result in zip(sources, results):
+            if isinstance(result, BaseException):
+                if not isinstance(result, Exception):
+                    raise result
+                failed[source.url] = result
+            elif result is not None:
+                payloads.append((source, *result))
+        self._record_download_timings(sources)
+        
+        # Sursele modificate sunt parsate în paralel (cele mari în executor)
+        parse_stats: list[dict[str, float]] = [{} for _ in payloads]
+        started = time.perf_counter()
+        parsed = await asyncio.gather(
+            *(
+                self._async_parse(chunks, payload_size, stats)
+                for (_, _, chunks, payload_size), stats in zip(payloads, parse_stats)
+            ),
+            return_exceptions=True,
+        )
+        if payloads:
+            parse_ms = (time.perf_counter() - started) * 1000
+            # Durata parsării include și extragerea județelor, raportată separat
+            self.timings.record("parse_ms", parse_ms)
+            self.timings.record(
+                "counties_ms", sum(stats.get("counties_ms", 0.0) for stats in parse_stats)
+            )
+            _LOGGER.debug("Parsed %d feed(s) in %.1f ms", len(payloads), parse_ms)
+        
+        changed = False
+        for (source, fingerprint, _, _), alerts in zip(payloads, parsed):
+            if isinstance(alerts, BaseException):
+                if not isinstance(alerts, Exception):
+                    raise alerts
+                # Un payload invalid nu înseamnă „fără alerte”: păstrăm alertele anterioare
+                # și uităm validatorii, ca următorul ciclu să nu primească un 304 pentru el
+                source.etag = source.last_modified = None
+                failed[source.url] = UpdateFailed(f"Invalid feed payload: {alerts}")
+                continue
+            source.fingerprint = fingerprint
+            source.alerts = alerts
+            changed = True
+        
+        for source in sources:
+            if (err := failed.get(source.url)) is None:
+                source.record_success()
+            elif not source.is_open():
+                # Cât timp breaker-ul e deschis, ciclurile sărite nu mai sunt numărate
+                source.record_failure(err)
+        
+        if len(failed) == len(sources):
+            raise next(iter(failed.values()))
+        for url, err in failed.items():
+            # Sursa care a eșuat contribuie cu ultimele alerte bune, celelalte continuă
+            _LOGGER.warning("Feed %s failed, keeping its previous alerts: %s", url, err)
+        
+        if not changed and self.data is not None:
+            return self._build_data(self._parsed_alerts)
+        
+        alerts = self._merge_sources()
+        self._set_parsed_alerts(alerts)
+        data = self._build_data(alerts)
+        self._fetched_at = data["last_update"]
+        self._store.async_delay_save(self._snapshot, STORAGE_SAVE_DELAY)
+        return data
+
+    async def _async_fetch_source(
+        self, session: aiohttp.ClientSession, source: FeedSource
+    ) -> tuple[str, list[bytes], int] | None:
+        """Download one source with bounded retries, unless its circuit breaker is open."""
+        if source.is_open():
+            raise UpdateFailed(f"Requests to {source.url} paused after repeated failures")
+        
+        # După deschiderea breaker-ului, o singură încercare de probă
+        for delay in () if source.half_open else _RETRY_DELAYS:
+            try:
+                return await self._async_request_source(session, source)
+            except _TransientError as err:
+                delay *= random.uniform(1, 1 + _POLL_JITTER)
+                _LOGGER.debug("Retrying %s in %.1f s: %s", source.url, delay, err)
+                await asyncio.sleep(delay)
+        return await self._async_request_source(session, source)
+
+    async def _async_request_source(
+        self, session: aiohttp.ClientSession, source: FeedSource
+    ) -> tuple[str, list[bytes], int] | None:
+        """Download one source; return (fingerprint, chunks, size), or None if unchanged."""
+        headers = {}
+        if self.data is not None:
+            # Trimitem validatorii doar când avem date anterioare de refolosit la un 304
+            if source.etag:
+                headers[hdrs.IF_NONE_MATCH] = source.etag
+            if source.last_modified:
+                headers[hdrs.IF_MODIFIED_SINCE] = source.last_modified
+        
+        source.connect_ms = source.download_ms = source.download_bytes = None
+        try:
+            async with asyncio.timeout(_SOURCE_TIMEOUT):
+                started = time.perf_counter()
+                async with session.get(source.url, headers=headers) as response:
+                    # Conectare + primii octeți (DNS/TCP/TLS, dacă nu există o conexiune refolosită)
+                    headers_at = time.perf_counter()
+                    source.connect_ms = (headers_at - started) * 1000
+                    if response.status == 304 and self.data is not None:
+                        _LOGGER.debug("Feed %s not modified (304), reusing its parsed alerts", source.url)
+                        return None
+                    
+                    if response.status == 429 or response.status >= 500:
+                        raise _TransientError(f"Error fetching data: {response.status}")
+                    if response.status != 200:
+                        raise UpdateFailed(f"Error fetching data: {response.status}")
+                    if (response.content_length or 0) > MAX_PAYLOAD_SIZE:
+                        raise UpdateFailed(
+                            f"Response too large: {response.content_length} bytes"
+                        )
+                    
+                    # Citire în bucăți, fără decodare la str (parserul respectă encoding-ul
+                    # din declarația XML); amprenta se calculează din mers
+                    hasher = hashlib.blake2b(digest_size=16)
+                    chunks: list[bytes] = []
+                    payload_size = 0
+                    async for chunk in response.content.iter_chunked(_CHUNK_SIZE):
+                        if not chunks and looks_like_html(chunk):
+                            # Pagină de eroare servită cu 200: nu o mai descărcăm
+                            raise UpdateFailed("Received an HTML page instead of the XML feed")
+                        payload_size += len(chunk)
+                        if payload_size > MAX_PAYLOAD_SIZE:
+                            # Fără Content-Length (sau cu unul greșit): oprim citirea la limită
+                            raise UpdateFailed(
+                                f"Response exceeds {MAX_PAYLOAD_SIZE} bytes, aborting download"
+                            )
+                        hasher.update(chunk)
+                        chunks.append(chunk)
+                    source.download_ms = (time.perf_counter() - headers_at) * 1000
+                    source.download_bytes = payload_size
+                    source.etag = response.headers.get(hdrs.ETAG)
+                    source.last_modified = response.headers.get(hdrs.LAST_MODIFIED)
+        except UpdateFailed:
+            raise
+        except aiohttp.ClientError as err:
+            raise _TransientError(f"Error communicating with API: {err}") from err
+        except TimeoutError as err:
+            raise _TransientError(f"Timeout fetching {source.url}") from err
+        except Exception as err:
+            raise UpdateFailed(f"Unexpected error: {err}") from err
+        
+        fingerprint = hasher.hexdigest()
+        if fingerprint == source.fingerprint and self.data is not None:
+            _LOGGER.debug("Feed %s payload unchanged (%s), skipping XML parsing", source.url, fingerprint)
+            return None
+        return fingerprint, chunks, payload_size
+
+    async def _async_parse(
+        self, chunks: list[bytes], payload_size: int, stats: dict[str, float]
+    ) -> list[Alert]:
+        """Parse a payload, in an executor when it is large enough to block the event loop."""
+        if payload_size >= _EXECUTOR_PARSE_THRESHOLD:
+            return await self.hass.async_add_executor_job(self._parse_xml, chunks, stats)
+        return self._parse_xml(chunks, stats)
+
+    def _record_download_timings(self, sources: list[FeedSource]) -> None:
+        """Record the cycle's network stages: the slowest source and the total size."""
+        for stage in ("connect_ms", "download_ms"):
+            values = [value for source in sources if (value := getattr(source, stage)) is not None]
+            if values:
+                self.timings.record(stage, max(values))
+        sizes = [source.download_bytes for source in sources if source.download_bytes is not None]
+        if sizes:
+            self.timings.record("download_bytes", sum(sizes))
+
+    def _merge_sources(self) -> list[Alert]:
+        """Combine the alerts of all sources, dropping the ones published by several feeds.
+
+        Alerts of the additional sources without a zona are skipped: their counties
+        cannot be placed, and without the attributes of the nowcasting format
+        they are likely from an unexpected feed layout.
+        """
+        merged: dict[tuple[str, ...], Alert] = {}
+        primary = self.urls[0]
+        for source in self.sources.values():
+            skipped = 0
+            for alert in source.alerts:
+                if source.url != primary and not alert.zona:
+                    skipped += 1
+                    continue
+                merged.setdefault(alert.key, alert)
+            if skipped:
+                _LOGGER.warning(
+                    "Skipped %d alert(s) without zona from %s; the feed format may have changed",
+                    skipped,
+                    source.url,
+                )
+        return list(merged.values())
+
+    async def async_restore(self) -> bool:
+        """Load the last persisted feed snapshot; return True if data was restored."""
+        if not (snapshot := await self._store.async_load()):
+            return False
+        
+        # Snapshot-urile cu o singură sursă au câmpurile direct la rădăcină
+        for url, state in (snapshot.get("sources") or {self.urls[0]: snapshot}).items():
+            if (source := self.sources.get(url)) is None:
+                continue
+            source.etag = state.get("etag")
+            source.last_modified = state.get("last_modified")
+            source.fingerprint = state.get("fingerprint")
+            source.alerts = [
+                alert
+                for record in state["alerts"]
+                if (alert := self._parse_alert_element(record)) is not None
+            ]
+        alerts = self._merge_sources()
+        self._fetched_at = snapshot.get("fetched_at")
+        # Snapshot-ul poate fi servit ca date vechi dacă prima actualizare eșuează
+        self._last_success = dt_util.parse_datetime(self._fetched_at) if self._fetched_at else None
+        self._set_parsed_alerts(alerts)
+        self.data = self._build_data(alerts, self._fetched_at)
+        _LOGGER.debug(
+            "Restored %d alert(s) from snapshot fetched at %s", len(alerts), self._fetched_at
+        )
+        return True
+
+    @callback
+    def _snapshot(self) -> dict[str, Any]:
+        """Return the compact snapshot of the last parsed feeds."""
+        return {
+            "fetched_at": self._fetched_at,
+            "sources": {
+                source.url: {
+                    "etag": source.etag,
+                    "last_modified": source.last_modified,
+                    "fingerprint": source.fingerprint,
+                    "alerts": [alert.as_record() for alert in source.alerts],
+                }
+                for source in self.sources.values()
+            },
+        }
+
+    def _parse_xml(
+        self, chunks: Iterable[bytes], stats: dict[str, float] | None = None
+    ) -> list[Alert]:
+        """Parse the XML feed from raw byte chunks (see parser.parse_feed).
+
+        Does not touch coordinator state, so it is safe to run in an executor.
+        """
+        return parse_feed(chunks, dt_util.DEFAULT_TIME_ZONE, stats)
+
+    def _build_data(self, alerts: list[Alert], last_update: str | None = None) -> dict[str, Any]:
+        """Build the coordinator payload, splitting out the currently active alerts.
+
+        When neither the alerts nor the active split changed, the previous payload
+        is returned as-is so that no state write is triggered for the sensors.
+        """
+        # Filtrare alerte active (începute și încă neterminate)
+        now = dt_util.now()
+        active_alerts = [
+            alert for alert in alerts
+            if alert.start_time and alert.end_time
+            and alert.start_time <= now < alert.end_time
+        ]
+        
+        # Programează reevaluarea exact la următorul început/sfârșit de alertă
+        self._schedule_next_transition(now)
+        
+        stale_since = self._stale_since.isoformat() if self._stale_since else None
+        if (
+            self.data is not None
+            and self.data["alerts"] == alerts
+            and self.data["active_alerts"] == active_alerts
+            and self.data["stale_since"] == stale_since
+        ):
+            return self.data
+        
+        if last_update is None:
+            # Cu date vechi rămâne momentul ultimelor date bune
+            last_update = self.data["last_update"] if stale_since and self.data else now.isoformat()
+        return {
+            "alerts": alerts,
+            "active_alerts": active_alerts,
+            "last_update": last_update,
+            # Setat cât timp sursele eșuează și se servesc ultimele date bune
+            "stale_since": stale_since,
+        }
+
+    def _set_parsed_alerts(self, alerts: list[Alert]) -> None:
+        """Store freshly parsed alerts and rebuild the sorted time boundaries."""
+        self._parsed_alerts = alerts
+        self._boundaries = sorted(
+            {
+                moment
+                for alert in alerts
+                for moment in (alert.start_time, alert.end_time)
+                if moment is not None
+            }
+        )
+
+    @callback
+    def _schedule_next_transition(self, now: datetime) -> None:
+        """Schedule a callback at the next alert start/end after now."""
+        if self._unsub_transition is not None:
+            self._unsub_transition()
+            self._unsub_transition = None
+        
+        index = bisect.bisect_right(self._boundaries, now)
+        if index < len(self._boundaries):
+            self._unsub_transition = async_track_point_in_utc_time(
+                self.hass, self._async_handle_transition, self._boundaries[index]
+            )
+
+    @callback
+    def _async_handle_transition(self, _now: datetime) -> None:
+        """Recompute the active alerts at a start/end boundary, without fetching."""
+        self._unsub_transition = None
+        data = self._build_data(self._parsed_alerts)
+        if data is not self.data:
+            _LOGGER.debug("Active alerts changed at scheduled boundary, updating entries")
+            self.data = data
+            self.async_update_listeners()
+
+    @callback
+    def async_subscribe(
+        self,
+        entry_id: str,
+        counties: list[str],
+        min_interval: int,
+        max_interval: int,
+        stale_window: int,
+    ) -> None:
+        """Register (or update) a config entry using this feed."""
+        self._subscribers[entry_id] = (
+            county_keys(counties),
+            min_interval,
+            max(max_interval, min_interval),
+            stale_window,
+        )
+        self._async_update_subscriptions()
+
+    @callback
+    def async_unsubscribe(self, entry_id: str) -> bool:
+        """Remove a config entry; return True when no entry uses the feed anymore."""
+        self._subscribers.pop(entry_id, None)
+        if self._subscribers:
+            self._async_update_subscriptions()
+        return not self._subscribers
+
+    @callback
+    def _async_update_subscriptions(self) -> None:
+        """Recompute the watched counties, polling bounds and stale window of all subscribers."""
+        subscriptions = self._subscribers.values()
+        # Un abonat fără județe (toată țara) înseamnă că urmărim tot feed-ul
+        if any(not keys for keys, _, _, _ in subscriptions):
+            self._watched_keys = None
+        else:
+            self._watched_keys = frozenset().union(*(keys for keys, _, _, _ in subscriptions))
+        # Cel mai exigent abonat stabilește limitele de polling și vechimea maximă a datelor
+        self._min_interval = min(min_interval for _, min_interval, _, _ in subscriptions)
+        self._max_interval = max(
+            self._min_interval, min(max_interval for _, _, max_interval, _ in subscriptions)
+        )
+        self._base_interval = min(max(DEFAULT_SCAN_INTERVAL, self._min_interval), self._max_interval)
+        self._stale_window = min(stale_window for _, _, _, stale_window in subscriptions)
+
+    def _is_watched(self, alert: Alert) -> bool:
+        """Return True if the alert affects a county watched by any entry."""
+        if self._watched_keys is None:
+            return True
+        return any(county_key(county) in self._watched_keys for county in alert.counties)
+
+    async def async_shutdown(self) -> None:
+        """Cancel the scheduled transition and shut down the coordinator.
+
+        Ignored while other config entries still use this feed; the last entry
+        to unload shuts it down.
+        """
+        if self._subscribers:
+            return
+        if self._unsub_transition is not None:
+            self._unsub_transition()
+            self._unsub_transition = None
+        if self.data is not None:
+            # Scrie acum snapshot-ul programat: o scriere întârziată ar putea recrea
+            # fișierul după ce async_remove_store l-a șters
+            await self._store.async_save(self._snapshot())
+        await super().async_shutdown()
+
+    def _parse_alert_element(self, record: Mapping[str, str]) -> Alert | None:
+        """Parse the raw attributes of an alert from the persistent snapshot."""
+        return parse_alert(record, dt_util.DEFAULT_TIME_ZONE)
+
+
+class AlerteNowcastingView(DataUpdateCoordinator):
+    """Per config entry view over a shared feed coordinator, sliced by county."""
+
+    def __init__(
+        self, hass: HomeAssistant, hub: AlerteNowcastingCoordinator, entry_id: str
+    ) -> None:
+        """Initialize."""
+        self.hub = hub
+        self.entry_id = entry_id
+        self.selected_counties: list[str] = ["România"]
+        self._selected_keys: frozenset[str] = frozenset()
+        # Crește la fiecare payload nou; senzorii își memorează atributele per generație
+        self.generation = 0
+        # Județele afectate de ultima actualizare; None înseamnă toți senzorii
+        self.changed_counties: frozenset[str] | None = None
+        # Durata filtrării pe județe și a notificării senzorilor
+        self.timings = StageTimings()
+        # Senzorii intrării exclud textele mari din istoric (opțiunea compact_attributes)
+        self.compact_attributes = False
+        super().__init__(
+            hass,
+            _LOGGER,
+            name=f"{DOMAIN}_{entry_id}",
+            # Fără polling propriu: datele vin de la coordinatorul partajat
+            update_interval=None,
+            always_update=False,
+        )
+        self._unsub_hub: CALLBACK_TYPE | None = None
+
+    @callback
+    def async_set_selection(self, counties: list[str]) -> None:
+        """Select the counties of this entry and re-slice the cached feed data."""
+        # Dacă nu sunt selectate județe, un singur senzor pentru toată România
+        self.selected_counties = list(counties) or ["România"]
+        # Set înghețat de chei normalizate (fără diacritice), calculat o singură dată.
+        # Gol înseamnă fără filtrare (senzorul "România" primește toate alertele).
+        self._selected_keys = county_keys(self.selected_counties)
+        if self.hub.data is not None:
+            # Schimbarea selecției nu înseamnă alerte noi/expirate: fără evenimente
+            self._async_handle_hub_update(fire_events=False)
+
+    @callback
+    def async_start(self) -> None:
+        """Start following the shared coordinator."""
+        if self._unsub_hub is None:
+            self._unsub_hub = self.hub.async_add_listener(self._async_handle_hub_update)
+
+    @callback
+    def _async_handle_hub_update(self, fire_events: bool = True) -> None:
+        """Re-slice the shared data whenever the feed coordinator updates."""
+        if not self.hub.last_update_success:
+            if self.last_update_success:
+                self.last_update_success = False
+                self.last_exception = self.hub.last_exception
+                self.changed_counties = None
+                self.async_update_listeners()
+            return
+        
+        started = time.perf_counter()
+        data = self._slice(self.hub.data)
+        self.timings.record("filter_ms", (time.perf_counter() - started) * 1000)
+        if data is self.data and self.last_update_success:
+            return
+        
+        # Evenimentele se emit pentru orice payload anterior, inclusiv la revenirea
+        # după eroare sau după o perioadă cu date vechi
+        changed = (
+            self._async_diff(self.data, data)
+            if self.data is not None and fire_events
+            else None
+        )
+        if (
+            changed is None
+            or not self.last_update_success
+            or self.data["stale_since"] != data["stale_since"]
+        ):
+            # Prima încărcare, revenire după eroare, altă selecție sau date devenite
+            # vechi/proaspete: toți senzorii
+            self.changed_counties = None
+        else:
+            self.changed_counties = changed
+        started = time.perf_counter()
+        self.async_set_updated_data(data)
+        # Scrierea stărilor tuturor senzorilor notificați
+        self.timings.record("fanout_ms", (time.perf_counter() - started) * 1000)
+
+    async def _async_update_data(self) -> dict[str, Any]:
+        """Refresh the shared feed on demand and return this entry's slice."""
+        await self.hub.async_request_refresh()
+        if not self.hub.last_update_success or self.hub.data is None:
+            raise UpdateFailed(f"Error fetching data: {self.hub.last_exception}")
+        self.changed_counties = None
+        return self._slice(self.hub.data)
+
+    @callback
+    def _async_diff(self, old: dict[str, Any], new: dict[str, Any]) -> frozenset[str]:
+        """Fire new/updated/expired events by stable alert id; return the affected counties."""
+        old_alerts = {county_alert.id: county_alert for county_alert in old["alerts"]}
+        new_alerts = {county_alert.id: county_alert for county_alert in new["alerts"]}
+        old_active = {county_alert.id for county_alert in old["active_alerts"]}
+        new_active = {county_alert.id for county_alert in new["active_alerts"]}
+        
+        changed: set[str] = set()
+        for alert_id, county_alert in new_alerts.items():
+            active = alert_id in new_active
+            if (previous := old_alerts.get(alert_id)) is None:
+                event_type = EVENT_ALERT_NEW
+            elif previous.alert != county_alert.alert or active != (alert_id in old_active):
+                event_type = EVENT_ALERT_UPDATED
+            else:
+                continue
+            changed.add(county_alert.county)
+            self.hass.bus.async_fire(event_type, self._event_data(county_alert, active))
+        
+        for alert_id in old_alerts.keys() - new_alerts.keys():
+            county_alert = old_alerts[alert_id]
+            changed.add(county_alert.county)
+            self.hass.bus.async_fire(EVENT_ALERT_EXPIRED, self._event_data(county_alert, False))
+        
+        return frozenset(changed)
+
+    def _event_data(self, county_alert: CountyAlert, active: bool) -> dict[str, Any]:
+        """Return the compact event payload for an alert."""
+        alert = county_alert.alert
+        return {
+            "entry_id": self.entry_id,
+            "id": county_alert.id,
+            "county": county_alert.county,
+            "title": alert.title,
+            "severity": alert.severity,
+            "severity_level": alert.severity_level,
+            "phenomena": list(alert.phenomena),
+            "start": alert.start_time.isoformat() if alert.start_time else None,
+            "end": alert.end_time.isoformat() if alert.end_time else None,
+            "active": active,
+        }
+
+    def _slice(self, hub_data: dict[str, Any]) -> dict[str, Any]:
+        """Build this entry's payload from the shared parsed alerts.
+
+        Only counties selected by this entry are expanded into CountyAlert
+        references. When nothing changed, the previous payload is returned as-is
+        so that no state write is triggered for the sensors.
+        """
+        alerts = self._expand(hub_data["alerts"])
+        active = set(map(id, hub_data["active_alerts"]))
+        active_alerts = [county_alert for county_alert in alerts if id(county_alert.alert) in active]
+        
+        if (
+            self.data is not None
+            and self.data["alerts"] == alerts
+            and self.data["active_alerts"] == active_alerts
+            and self.data["stale_since"] == hub_data["stale_since"]
+        ):
+            return self.data
+        
+        self.generation += 1
+        return {
+            "alerts": alerts,
+            "active_alerts": active_alerts,
+            # Indexuri județ -> alerte, construite o singură dată per actualizare
+            "county_alerts": self._index_by_county(alerts),
+            "county_active_alerts": self._index_by_county(active_alerts),
+            # Contoarele alertelor active din județele acestei intrări
+            "summary": self._summarize(active_alerts),
+            "last_update": hub_data["last_update"],
+            "stale_since": hub_data["stale_since"],
+        }
+
+    def _expand(self, alerts: list[Alert]) -> list[CountyAlert]:
+        """Split alerts per county, keeping only the counties selected for this entry."""
+        selected = self._selected_keys
+        return [
+            CountyAlert(alert, county, alert.zona_for(county))
+            for alert in alerts
+            for county in alert.counties
+            if not selected or county_key(county) in selected
+        ]
+
+    @staticmethod
+    def _summarize(alerts: list[CountyAlert]) -> AlertSummary:
+        """Count alerts by severity, phenomenon and message type, with their counties."""
+        by_alert: dict[int, tuple[Alert, list[str]]] = {}
+        for county_alert in alerts:
+            by_alert.setdefault(id(county_alert.alert), (county_alert.alert, []))[1].append(
+                county_alert.county
+            )
+        summary = AlertSummary()
+        for alert, counties in by_alert.values():
+            summary.add(alert, counties)
+        return summary
+
+    @staticmethod
+    def _index_by_county(alerts: list[CountyAlert]) -> dict[str, list[CountyAlert]]:
+        """Group alerts by the counties they affect."""
+        index: dict[str, list[CountyAlert]] = {}
+        for county_alert in alerts:
+            index.setdefault(county_alert.county, []).append(county_alert)
+        return index
+
+    async def async_shutdown(self) -> None:
+        """Stop following the shared coordinator."""
+        if self._unsub_hub is not None:
+            self._unsub_hub()
+            self._unsub_hub = None
+        await super().async_shutdown()
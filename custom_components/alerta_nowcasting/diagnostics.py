@@ -0,0 +1,73 @@
+"""Diagnostics support for Alerte Nowcasting integration."""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+
+if TYPE_CHECKING:
+    from .coordinator import AlerteNowcastingView
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    view: AlerteNowcastingView = hass.data[DOMAIN][entry.entry_id]
+    hub = view.hub
+    hub_data = hub.data or {}
+    view_data = view.data or {}
+
+    return {
+        "entry": {
+            "data": dict(entry.data),
+            "options": dict(entry.options),
+        },
+        "feed": {
+            "sources": [
+                {
+                    "url": source.url,
+                    "alerts": len(source.alerts),
+                    "etag": source.etag,
+                    "fingerprint": source.fingerprint,
+                    "last_error": source.last_error,
+                    "consecutive_failures": source.failures,
+                    "paused": source.is_open(),
+                    "connect_ms": source.connect_ms,
+                    "download_ms": source.download_ms,
+                    "download_bytes": source.download_bytes,
+                }
+                for source in hub.sources.values()
+            ],
+            "last_update_success": hub.last_update_success,
+            "last_exception": repr(hub.last_exception) if hub.last_exception else None,
+            "update_interval": hub.update_interval.total_seconds() if hub.update_interval else None,
+            "last_update": hub_data.get("last_update"),
+            "stale_since": hub_data.get("stale_since"),
+            "alerts": len(hub_data.get("alerts", [])),
+            "active_alerts": len(hub_data.get("active_alerts", [])),
+            # Etape la nivel de feed: conectare, descărcare, parsare, extragere județe
+            "timings": hub.timings.as_dict(),
+        },
+        "entry_view": {
+            "selected_counties": view.selected_counties,
+            "generation": view.generation,
+            "alerts": len(view_data.get("alerts", [])),
+            "active_alerts": len(view_data.get("active_alerts", [])),
+            "compact_attributes": view.compact_attributes,
+            "summary": {
+                "by_severity": summary.by_severity,
+                "by_phenomenon": summary.by_phenomenon,
+                "by_message_type": summary.by_message_type,
+            } if (summary := view_data.get("summary")) else None,
+            # Textul complet al alertelor, exclus din istoric în modul compact
+            "alert_details": [
+                county_alert.as_dict() for county_alert in view_data.get("alerts", [])
+            ],
+            # Etape la nivel de intrare: filtrare pe județe, notificare senzori
+            "timings": view.timings.as_dict(),
+        },
+    }
@@ -0,0 +1,183 @@
+"""Data models for Alerte Nowcasting integration."""
+from __future__ import annotations
+
+import hashlib
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any
+
+from .const import SEVERITY_LEVELS
+
+
+@dataclass(frozen=True, slots=True)
+class Alert:
+    """One <avertizare> from the feed, shared by all the counties it covers."""
+
+    created: str
+    modified: str
+    color_code: str
+    message_type: str
+    message_type_name: str
+    # Valori RAW din API (deja decodate din HTML entities)
+    severity_name: str
+    description: str
+    zona: str
+    start_raw: str
+    end_raw: str
+    # Date parsate o singură dată
+    start_time: datetime | None
+    end_time: datetime | None
+    # Ore de afișare (HH:MM, ora locală), precalculate la parsare
+    start_display: str | None
+    end_display: str | None
+    counties: tuple[str, ...]
+    # Fragmentul din zona pentru fiecare județ: ((județ, fragment), ...)
+    zona_fragments: tuple[tuple[str, str], ...]
+    # Fenomene detectate în descriere, cel mai important primul
+    phenomena: tuple[str, ...]
+    # Amprenta scurtă a identității (key), calculată o singură dată; baza id-urilor per județ
+    key_hash: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        """Compute the short hash of the alert identity."""
+        digest = hashlib.blake2b("\x1f".join(self.key).encode(), digest_size=6).hexdigest()
+        object.__setattr__(self, "key_hash", digest)
+
+    @property
+    def title(self) -> str:
+        """Return the alert title as shown by the API."""
+        return f"{self.message_type_name} - Cod {self.severity_name}"
+
+    @property
+    def key(self) -> tuple[str, ...]:
+        """Return the identity used to merge the same alert published by several feeds.
+
+        Times and text are part of it, so alerts of a feed lacking some of the
+        attributes are not collapsed into one.
+        """
+        return (
+            self.created,
+            self.color_code,
+            self.message_type,
+            self.zona,
+            self.start_raw,
+            self.end_raw,
+            self.description,
+        )
+
+    @property
+    def severity(self) -> str:
+        """Return the Romanian severity name (galben/portocaliu/rosu)."""
+        return self.severity_name.lower()
+
+    @property
+    def severity_level(self) -> str:
+        """Return the English severity level (yellow/orange/red)."""
+        return SEVERITY_LEVELS.get(self.severity, "unknown")
+
+    @property
+    def main_phenomenon(self) -> str:
+        """Return the top ranked phenomenon, or "default" when none was detected."""
+        return self.phenomena[0] if self.phenomena else "default"
+
+    def as_record(self) -> dict[str, str]:
+        """Return the alert as the raw API attributes, for the persistent snapshot."""
+        return {
+            "tipMesaj": self.message_type,
+            "numeTipMesaj": self.message_type_name,
+            "dataInceput": self.start_raw,
+            "dataSfarsit": self.end_raw,
+            "zona": self.zona,
+            "semnalare": self.description,
+            "culoare": self.color_code,
+            "numeCuloare": self.severity_name,
+            "modificat": self.modified,
+            "creat": self.created,
+        }
+
+    def zona_for(self, county: str) -> str:
+        """Return the part of the zona text for a county, or the full text if not found."""
+        for fragment_county, fragment in self.zona_fragments:
+            if fragment_county == county:
+                return fragment
+        return self.zona
+
+
+@dataclass(frozen=True, slots=True)
+class CountyAlert:
+    """Lightweight per-county view over a shared Alert."""
+
+    alert: Alert
+    county: str
+    # Partea din zona care privește doar acest județ
+    zona: str
+
+    @property
+    def id(self) -> str:
+        """Return the stable id of this alert for this county.
+
+        Derived from the same identity used to merge the sources, so two alerts
+        kept apart by the merge never share an id.
+        """
+        return f"{self.alert.key_hash}_{self.county}"
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the alert as a flat dict (built on demand, e.g. for diagnostics)."""
+        alert = self.alert
+        return {
+            "id": self.id,
+            "title": alert.title,
+            "description": alert.description,
+            "severity": alert.severity,
+            "severity_level": alert.severity_level,
+            "color_code": alert.color_code,
+            "message_type": alert.message_type,
+            "message_type_name": alert.message_type_name,
+            "counties": [self.county],
+            "zona": f"Județul {self.county}",
+            "zona_original": alert.zona,
+            "created": alert.created,
+            "modified": alert.modified,
+            "start_time": alert.start_time,
+            "end_time": alert.end_time,
+            "dataInceput": alert.start_raw,
+            "dataSfarsit": alert.end_raw,
+            "numeCuloare": alert.severity_name,
+            "semnalare": alert.description,
+            "zona_api": alert.zona,
+            "phenomena": alert.main_phenomenon,
+            "phenomena_all": list(alert.phenomena),
+        }
+
+
+@dataclass(slots=True)
+class AlertSummary:
+    """Aggregate counters over a set of alerts, filled in while the alerts are split out.
+
+    Only the given counties are recorded, so the summary of an entry lists just
+    the counties it selected.
+    """
+
+    total: int = 0
+    by_severity: dict[str, int] = field(
+        default_factory=lambda: dict.fromkeys(SEVERITY_LEVELS.values(), 0)
+    )
+    by_phenomenon: dict[str, int] = field(default_factory=dict)
+    by_message_type: dict[str, int] = field(default_factory=dict)
+    # Județele afectate, per nivel de severitate și per fenomen
+    counties_by_severity: dict[str, set[str]] = field(default_factory=dict)
+    counties_by_phenomenon: dict[str, set[str]] = field(default_factory=dict)
+
+    def add(self, alert: Alert, counties: Iterable[str]) -> None:
+        """Count one alert affecting the given counties."""
+        self.total += 1
+        level = alert.severity_level
+        self.by_severity[level] = self.by_severity.get(level, 0) + 1
+        self.counties_by_severity.setdefault(level, set()).update(counties)
+        self.by_message_type[alert.message_type_name] = (
+            self.by_message_type.get(alert.message_type_name, 0) + 1
+        )
+        for phenomenon in alert.phenomena:
+            self.by_phenomenon[phenomenon] = self.by_phenomenon.get(phenomenon, 0) + 1
+            self.counties_by_phenomenon.setdefault(phenomenon, set()).update(counties)
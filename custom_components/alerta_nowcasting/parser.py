@@ -0,0 +1,309 @@
+"""Feed parser for Alerte Nowcasting integration.
+
+Pure Python (no Home Assistant imports), so it loads fast and can run in an
+executor or in offline tools such as the benchmarks.
+"""
+from __future__ import annotations
+
+import logging
+import re
+import time
+from collections.abc import Iterable, Mapping
+from datetime import datetime, tzinfo
+from html import unescape
+import xml.etree.ElementTree as ET
+
+from .const import ROMANIAN_COUNTIES
+from .models import Alert
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class FeedParseError(Exception):
+    """Error to indicate the feed payload is not valid XML."""
+
+
+# Începutul unei pagini HTML (pagină de eroare/mentenanță servită în locul feed-ului)
+_HTML_PREFIXES = (b"<!doctype html", b"<html")
+
+
+def looks_like_html(head: bytes) -> bool:
+    """Return True if the first bytes of a payload are an HTML page rather than XML."""
+    return head.lstrip(b"\xef\xbb\xbf \t\r\n")[:14].lower().startswith(_HTML_PREFIXES)
+
+
+def _unescape(text: str) -> str:
+    """Decode HTML entities left after XML decoding, only when there are any."""
+    return unescape(text) if "&" in text else text
+
+
+# Tabel de eliminare diacritice (inclusiv variantele cu sedilă ş/ţ folosite de unele surse)
+_DIACRITICS_TABLE = str.maketrans("ăâîșşțţãĂÂÎȘŞȚŢÃ", "aaisstta" "AAISSTTA")
+
+# Tag-uri HTML din câmpul zona (ex. <br>)
+_HTML_TAG_RE = re.compile(r"<[^>]+>")
+
+# Separator flexibil pentru numele compuse ("Bistrița-Năsăud", "Satu Mare")
+_COUNTY_SEPARATOR_RE = re.compile(r"[\s-]+")
+
+
+def _fold_diacritics(text: str) -> str:
+    """Lowercase text and strip Romanian diacritics for comparison."""
+    return text.translate(_DIACRITICS_TABLE).lower()
+
+
+def _normalize_county(text: str) -> str:
+    """Fold a county name to its lookup key (no diacritics, single-space separated)."""
+    return _COUNTY_SEPARATOR_RE.sub(" ", _fold_diacritics(text).strip())
+
+
+# Numele oficial din ROMANIAN_COUNTIES -> județ normalizat, și invers. Alertele
+# folosesc doar numele oficiale, deci cheile lor nu mai sunt recalculate.
+_KEY_BY_COUNTY = {county: _normalize_county(county) for county in ROMANIAN_COUNTIES}
+_COUNTY_BY_KEY = {key: county for county, key in _KEY_BY_COUNTY.items()}
+
+
+def county_key(text: str) -> str:
+    """Return the lookup key of a county name (folded, single-space separated)."""
+    return _KEY_BY_COUNTY.get(text) or _normalize_county(text)
+
+# O singură alternanță compilată la import; numele lungi primele ca să câștige
+# în fața prefixelor. "Județul X" este acoperit implicit de potrivirea pe "X".
+_COUNTY_RE = re.compile(
+    r"\b("
+    + "|".join(
+        r"[\s-]+".join(re.escape(word) for word in key.split(" "))
+        for key in sorted(_COUNTY_BY_KEY, key=len, reverse=True)
+    )
+    + r")\b"
+)
+
+
+# Segmentare zona: ";<br>", "<br>" sau ";" urmat de "Județul"
+_ZONA_SPLIT_RE = re.compile(r";?<br\s*/?>|;(?=\s*Jude[țţt])", re.IGNORECASE)
+
+# Antetul unui segment de zona: "Județul X:"
+_ZONA_COUNTY_RE = re.compile(r"Jude[țţt]ul\s+(.+?)\s*:", re.IGNORECASE)
+
+
+def split_zona(zona: str) -> tuple[tuple[str, str], ...]:
+    """Split a zona text into (county, fragment) pairs, one per "Județul X:" segment."""
+    fragments: dict[str, str] = {}
+    for part in _ZONA_SPLIT_RE.split(zona):
+        if (match := _ZONA_COUNTY_RE.search(part)) is None:
+            continue
+        county = _COUNTY_BY_KEY.get(county_key(match.group(1)))
+        if county is not None and county not in fragments:
+            fragments[county] = part.strip()
+    return tuple(fragments.items())
+
+
+# Clasificator fenomene: o singură alternanță cu grupuri numite, aplicată pe
+# textul fără diacritice. Numele grupului este cheia din PHENOMENA_TYPES.
+_PHENOMENA_RE = re.compile(
+    "|".join(
+        f"(?P<{phenomenon}>{pattern})"
+        for phenomenon, pattern in (
+            ("ceata", r"\bceata"),
+            ("polei", r"\bpolei"),
+            ("ninsoare", r"\bninso(?:are|ri)"),
+            ("viscol", r"\bviscol"),
+            ("ploi_torentiale", r"\bplo(?:i|ile|ilor|aie|aia|aiei|ua|uat)\b|\btorential"),
+            ("grindina", r"\bgrindin"),
+            ("vijelie", r"\bvijeli|\bfurtun"),
+            ("fulger", r"\bfulger|\bdescarcari electrice"),
+            ("vant_puternic", r"\bvant|\brafal"),
+            ("instabilitate", r"\binstabilitate"),
+        )
+    )
+)
+
+
+def detect_phenomena(description: str) -> tuple[str, ...]:
+    """Return all phenomena mentioned in a description, most mentioned first.
+
+    Ties are broken by the position of the first mention.
+    """
+    hits: dict[str, list[int]] = {}
+    for match in _PHENOMENA_RE.finditer(_fold_diacritics(description)):
+        if (phenomenon := match.lastgroup) is not None:
+            hits.setdefault(phenomenon, [0, match.start()])[0] += 1
+    return tuple(sorted(hits, key=lambda phenomenon: (-hits[phenomenon][0], hits[phenomenon][1])))
+
+
+def county_keys(counties: Iterable[str]) -> frozenset[str]:
+    """Return the folded keys of selected counties; empty means the whole country."""
+    return frozenset(county_key(county) for county in counties if county != "România")
+
+
+def extract_counties(zona: str) -> list[str]:
+    """Find all counties mentioned in a zona text in a single pass."""
+    zona_clean = _fold_diacritics(_HTML_TAG_RE.sub(" ", zona))
+    
+    counties: list[str] = []
+    for match in _COUNTY_RE.finditer(zona_clean):
+        county = _COUNTY_BY_KEY[county_key(match.group(1))]
+        if county not in counties:
+            counties.append(county)
+    
+    return counties
+
+
+def parse_feed(
+    chunks: Iterable[bytes], tz: tzinfo, stats: dict[str, float] | None = None
+) -> list[Alert]:
+    """Parse the XML feed incrementally from raw byte chunks and extract alerts.
+
+    Each <avertizare> element is processed as soon as it is complete and then
+    released, so the full document tree is never kept in memory. The bytes are
+    handed to the parser as-is, letting it honor the XML declaration encoding.
+    Times without an offset are taken as local time in tz. When a stats dict is
+    given, the time spent extracting counties is added to it.
+
+    Raises FeedParseError when the payload is not valid XML or is an HTML page,
+    so that a broken response is never mistaken for a feed without alerts. A
+    blank body is taken as a feed without alerts.
+    """
+    try:
+        parser = ET.XMLPullParser(events=("start", "end"))
+        root: ET.Element | None = None
+        alerts = []
+        element_count = 0
+        blank = True
+        
+        for chunk in chunks:
+            if blank and chunk and not chunk.isspace():
+                blank = False
+                if looks_like_html(chunk):
+                    raise FeedParseError("Received an HTML page instead of the XML feed")
+            parser.feed(chunk)
+            for event, elem in parser.read_events():
+                if event == "start":
+                    if root is None:
+                        root = elem
+                    continue
+                if elem.tag != "avertizare":
+                    continue
+                
+                # Parsare alerte din noul format API (cu atribute)
+                element_count += 1
+                alert = parse_alert(elem, tz, stats)
+                if alert:
+                    alerts.append(alert)
+                
+                # Eliberează elementul procesat (și referințele din rădăcină)
+                elem.clear()
+                root.clear()
+        if blank:
+            _LOGGER.debug("Empty feed body, no alerts")
+            return []
+        parser.close()
+        
+        # Log pentru debugging
+        _LOGGER.debug(
+            "Parsed XML. Root tag: %s, avertizare elements: %d",
+            root.tag if root is not None else None,
+            element_count,
+        )
+        
+        # Log pentru rezultate
+        if not alerts:
+            _LOGGER.debug("No alerts found in XML. This is normal when there are no active weather warnings.")
+        else:
+            _LOGGER.debug("Found %d alert(s) in XML", len(alerts))
+        
+        return alerts
+        
+    except ET.ParseError as err:
+        raise FeedParseError(f"Error parsing XML: {err}") from err
+
+
+def parse_alert(
+    element: ET.Element | Mapping[str, str], tz: tzinfo, stats: dict[str, float] | None = None
+) -> Alert | None:
+    """Parse an avertizare XML element (or its attributes from a snapshot)."""
+    try:
+        # Extrage toate atributele din noul format API
+        tip_mesaj = element.get("tipMesaj", "")
+        nume_tip_mesaj = element.get("numeTipMesaj", "")
+        data_inceput = element.get("dataInceput", "")
+        data_sfarsit = element.get("dataSfarsit", "")
+        zona = element.get("zona", "")
+        semnalare = element.get("semnalare", "")
+        culoare = element.get("culoare", "")
+        nume_culoare = element.get("numeCuloare", "")
+        modificat = element.get("modificat", "")
+        creat = element.get("creat", "")
+        
+        # Decodare HTML entities rămase după decodarea XML (ex. &amp;#x21B; = ț)
+        zona = _unescape(zona)
+        semnalare = _unescape(semnalare)
+        nume_culoare = _unescape(nume_culoare)
+        
+        # Extragere județe din câmpul zona
+        started = time.perf_counter()
+        counties = extract_counties(zona)
+        if stats is not None:
+            stats["counties_ms"] = (
+                stats.get("counties_ms", 0.0) + (time.perf_counter() - started) * 1000
+            )
+        
+        # Dacă nu s-au găsit județe, returnează o singură alertă cu zona completă
+        if not counties:
+            _LOGGER.debug("No counties extracted from zona: %s", zona)
+            counties = ["Necunoscut"]
+        
+        # Parsare date și ore - se face o singură dată
+        start_time = _parse_time(data_inceput, tz)
+        end_time = _parse_time(data_sfarsit, tz)
+        
+        # Detectare fenomen din descriere
+        phenomena = detect_phenomena(semnalare)
+        
+        # Payload-ul comun este păstrat o singură dată; fiecare intrare își
+        # construiește doar referințele ușoare (CountyAlert) pentru județele ei
+        return Alert(
+            created=creat,
+            modified=modificat,
+            color_code=culoare,
+            message_type=tip_mesaj,
+            message_type_name=nume_tip_mesaj,
+            severity_name=nume_culoare,
+            description=semnalare,
+            zona=zona,
+            start_raw=data_inceput,
+            end_raw=data_sfarsit,
+            start_time=start_time,
+            end_time=end_time,
+            start_display=_format_time(start_time, data_inceput, tz),
+            end_display=_format_time(end_time, data_sfarsit, tz),
+            counties=tuple(counties),
+            zona_fragments=split_zona(zona),
+            phenomena=phenomena,
+        )
+        
+    except Exception as err:
+        _LOGGER.error("Error parsing alert element: %s", err)
+        return None
+
+
+def _parse_time(value: str, tz: tzinfo) -> datetime | None:
+    """Parse an ISO timestamp from the API; naive values are local time in tz."""
+    if not value:
+        return None
+    try:
+        moment = datetime.fromisoformat(value)
+    except ValueError as err:
+        _LOGGER.warning("Could not parse time '%s': %s", value, err)
+        return None
+    if moment.tzinfo is None:
+        # API-ul returnează timpul în timezone-ul local (România/București), nu în UTC
+        moment = moment.replace(tzinfo=tz)
+    return moment
+
+
+def _format_time(moment: datetime | None, raw: str, tz: tzinfo) -> str | None:
+    """Format a parsed datetime as local time only (HH:MM), falling back to the raw value."""
+    if moment is None:
+        return raw or None
+    return moment.astimezone(tz).strftime("%H:%M")
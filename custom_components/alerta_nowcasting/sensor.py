@@ -2,322 +2,217 @@
 from __future__ import annotations
 
 import logging
-import re
-from datetime import timedelta
-from typing import Any
-import xml.etree.ElementTree as ET
-from html import unescape
+from collections.abc import Callable
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any
 
-import aiohttp
-import async_timeout
-
-from homeassistant.components.sensor import SensorEntity
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.const import EntityCategory, UnitOfInformation, UnitOfTime
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import (
-    CoordinatorEntity,
-    DataUpdateCoordinator,
-    UpdateFailed,
-)
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.util import dt as dt_util
 
 from .const import (
     DOMAIN,
-    CONF_API_URL,
-    CONF_COUNTIES,
-    DEFAULT_SCAN_INTERVAL,
+    SIGNAL_COUNTIES_UPDATED,
     ATTR_ACTIVE_ALERTS,
     ATTR_LAST_UPDATE,
+    PHENOMENA_DISPLAY,
     PHENOMENA_ICONS,
     PHENOMENA_TYPES,
+    SEVERITY_DISPLAY,
     SEVERITY_LEVELS,
     COLOR_CODES,
     MESSAGE_TYPES,
-    ROMANIAN_COUNTIES,
+    UNRECORDED_ATTRIBUTES,
 )
 
+if TYPE_CHECKING:
+    from .coordinator import AlerteNowcastingView
+    from .models import AlertSummary, CountyAlert
+
 _LOGGER = logging.getLogger(__name__)
 
 
+@dataclass(frozen=True, kw_only=True)
+class AlerteNowcastingTimingDescription(SensorEntityDescription):
+    """Describes a refresh timing diagnostic sensor."""
+
+    value_fn: Callable[[AlerteNowcastingView], float | None]
+
+
+def _duration(key: str, name: str, source: str = "hub") -> AlerteNowcastingTimingDescription:
+    """Describe a duration (ms) measured by the shared coordinator or the entry view."""
+    return AlerteNowcastingTimingDescription(
+        key=key,
+        name=name,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=1,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        value_fn=(
+            (lambda view: view.hub.timings.last.get(key))
+            if source == "hub"
+            else (lambda view: view.timings.last.get(key))
+        ),
+    )
+
+
+# Senzori de diagnostic (dezactivați implicit) pentru etapele unui ciclu de actualizare
+TIMING_SENSORS: tuple[AlerteNowcastingTimingDescription, ...] = (
+    _duration("connect_ms", "Durată conectare"),
+    _duration("download_ms", "Durată descărcare"),
+    AlerteNowcastingTimingDescription(
+        key="download_bytes",
+        name="Dimensiune descărcare",
+        native_unit_of_measurement=UnitOfInformation.BYTES,
+        device_class=SensorDeviceClass.DATA_SIZE,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        value_fn=lambda view: view.hub.timings.last.get("download_bytes"),
+    ),
+    _duration("parse_ms", "Durată parsare XML"),
+    _duration("counties_ms", "Durată extragere județe"),
+    _duration("filter_ms", "Durată filtrare județe", source="view"),
+    _duration("fanout_ms", "Durată actualizare senzori", source="view"),
+)
+
+
+@dataclass(frozen=True, kw_only=True)
+class AlerteNowcastingSummaryDescription(SensorEntityDescription):
+    """Describes a summary sensor over the active alerts of an entry."""
+
+    value_fn: Callable[[AlertSummary], int]
+    attrs_fn: Callable[[AlertSummary], dict[str, Any]]
+
+
+def _severity(level: str, name: str, icon: str) -> AlerteNowcastingSummaryDescription:
+    """Describe the number of active alerts of one severity level."""
+    return AlerteNowcastingSummaryDescription(
+        key=f"alerte_{level}",
+        name=name,
+        icon=icon,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda summary: summary.by_severity.get(level, 0),
+        attrs_fn=lambda summary: {
+            "Județe": sorted(summary.counties_by_severity.get(level, ())),
+        },
+    )
+
+
+# Senzori de sumar pentru județele intrării (toată țara fără selecție), calculați
+# o singură dată per payload de vederea intrării
+SUMMARY_SENSORS: tuple[AlerteNowcastingSummaryDescription, ...] = (
+    AlerteNowcastingSummaryDescription(
+        key="alerte_active",
+        name="Alerte active",
+        icon="mdi:alert",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda summary: summary.total,
+        attrs_fn=lambda summary: {
+            SEVERITY_DISPLAY[severity]: summary.by_severity.get(level, 0)
+            for severity, level in SEVERITY_LEVELS.items()
+        } | {
+            "Tipuri mesaj": dict(summary.by_message_type),
+        },
+    ),
+    _severity("yellow", "Alerte galbene", "mdi:alert-outline"),
+    _severity("orange", "Alerte portocalii", "mdi:alert"),
+    _severity("red", "Alerte roșii", "mdi:alert-octagon"),
+    AlerteNowcastingSummaryDescription(
+        key="fenomene_active",
+        name="Fenomene active",
+        icon="mdi:weather-lightning-rainy",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda summary: len(summary.by_phenomenon),
+        attrs_fn=lambda summary: {
+            PHENOMENA_DISPLAY.get(phenomenon, phenomenon): {
+                "Alerte": count,
+                "Județe": sorted(summary.counties_by_phenomenon.get(phenomenon, ())),
+            }
+            for phenomenon, count in summary.by_phenomenon.items()
+        },
+    ),
+)
+
+
+@lru_cache(maxsize=32)
+def _format_ro_datetime(value: str) -> str | None:
+    """Format datetime string to Romanian display format (DD.MM.YYYY HH:MM).
+
+    Memoized: all sensors format the same last_update value after each refresh.
+    """
+    if not value:
+        return None
+    try:
+        dt = dt_util.parse_datetime(value)
+        if dt:
+            dt = dt_util.as_local(dt)
+            return dt.strftime("%d.%m.%Y %H:%M")
+    except Exception:
+        return value
+    return value
+
+
 async def async_setup_entry(
     hass: HomeAssistant,
     entry: ConfigEntry,
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up the Alerte Nowcasting sensor."""
-    api_url = entry.data.get(CONF_API_URL)
-    
-    # Citesc județele din opțiuni (dacă există) sau din config data
-    selected_counties = entry.options.get(CONF_COUNTIES) or entry.data.get(CONF_COUNTIES, [])
-    
-    # Dacă nu sunt selectate județe, creeaz un senzor pentru toată România
-    if not selected_counties:
-        selected_counties = ["România"]
-    
-    coordinator = AlerteNowcastingCoordinator(hass, api_url, selected_counties)
-    await coordinator.async_config_entry_first_refresh()
-    
-    # Creez senzori separați pentru fiecare județ/regiune
-    entities = []
-    for county in selected_counties:
-        entities.append(AlerteNowcastingSensor(coordinator, entry, county))
+    view: AlerteNowcastingView = hass.data[DOMAIN][entry.entry_id]
+    sensors: dict[str, AlerteNowcastingSensor] = {}
+    # Modul compact: textele mari nu ajung în istoric (schimbarea opțiunii reîncarcă intrarea)
+    sensor_class = (
+        AlerteNowcastingCompactSensor
+        if view.compact_attributes
+        else AlerteNowcastingSensor
+    )
     
-    async_add_entities(entities, True)
-
-
-class AlerteNowcastingCoordinator(DataUpdateCoordinator):
-    """Class to manage fetching data from the API."""
-
-    def __init__(self, hass: HomeAssistant, api_url: str, selected_counties: list[str]) -> None:
-        """Initialize."""
-        self.api_url = api_url
-        self.selected_counties = selected_counties
-        super().__init__(
-            hass,
-            _LOGGER,
-            name=DOMAIN,
-            update_interval=timedelta(seconds=DEFAULT_SCAN_INTERVAL),
-        )
-
-    async def _async_update_data(self) -> dict[str, Any]:
-        """Fetch data from API."""
-        try:
-            async with async_timeout.timeout(30):
-                async with aiohttp.ClientSession() as session:
-                    async with session.get(self.api_url) as response:
-                        if response.status != 200:
-                            raise UpdateFailed(f"Error fetching data: {response.status}")
-                        
-                        xml_data = await response.text()
-                        return self._parse_xml(xml_data)
-        except aiohttp.ClientError as err:
-            raise UpdateFailed(f"Error communicating with API: {err}") from err
-        except Exception as err:
-            raise UpdateFailed(f"Unexpected error: {err}") from err
-
-    def _parse_xml(self, xml_data: str) -> dict[str, Any]:
-        """Parse XML data and extract alerts."""
-        try:
-            root = ET.fromstring(xml_data)
-            alerts = []
-            
-            # Log pentru debugging
-            _LOGGER.debug("Parsing XML. Root tag: %s, children count: %d", root.tag, len(list(root)))
-            
-            # Parsare alerte din noul format API (cu atribute)
-            for alert_elem in root.findall(".//avertizare"):
-                alert_list = self._parse_alert_element(alert_elem)
-                if alert_list:
-                    # _parse_alert_element acum returnează lista de alerte (una per județ)
-                    alerts.extend(alert_list)
-            
-            # Log pentru rezultate
-            if not alerts:
-                _LOGGER.debug("No alerts found in XML. This is normal when there are no active weather warnings.")
-            else:
-                _LOGGER.debug("Found %d alert(s) in XML (split by county)", len(alerts))
-            
-            # Filtrare după județele selectate
-            if self.selected_counties:
-                alerts = self._filter_alerts_by_counties(alerts)
-                _LOGGER.debug("After county filtering: %d alert(s)", len(alerts))
-            
-            # Filtrare alerte active
-            now = dt_util.now()
-            active_alerts = [
-                alert for alert in alerts
-                if alert.get("start_time") and alert.get("end_time")
-                and alert["start_time"] <= now <= alert["end_time"]
-            ]
-            
-            return {
-                "alerts": alerts,
-                "active_alerts": active_alerts,
-                "last_update": dt_util.now().isoformat(),
-            }
-            
-        except ET.ParseError as err:
-            _LOGGER.error("Error parsing XML: %s", err)
-            return {"alerts": [], "active_alerts": [], "last_update": dt_util.now().isoformat()}
-        except Exception as err:
-            _LOGGER.error("Unexpected error parsing XML: %s", err)
-            return {"alerts": [], "active_alerts": [], "last_update": dt_util.now().isoformat()}
-
-    def _filter_alerts_by_counties(self, alerts: list[dict[str, Any]]) -> list[dict[str, Any]]:
-        """Filter alerts to include only those affecting selected counties."""
-        filtered_alerts = []
-        
-        for alert in alerts:
-            alert_counties = alert.get("counties", [])
-            # Verifică dacă vreun județ din alertă se potrivește cu județele selectate
-            # Folosim verificare case-insensitive și eliminăm diacritice pentru flexibilitate
-            if any(
-                self._normalize_county(county) in [self._normalize_county(c) for c in self.selected_counties]
-                for county in alert_counties
-            ):
-                filtered_alerts.append(alert)
+    @callback
+    def _async_sync_sensors() -> None:
+        """Creez senzori pentru județele noi și îi elimin pe cei deselectați."""
+        registry = er.async_get(hass)
+        for county in list(sensors):
+            if county not in view.selected_counties:
+                sensor = sensors.pop(county)
+                if sensor.entity_id and registry.async_get(sensor.entity_id):
+                    registry.async_remove(sensor.entity_id)
         
-        return filtered_alerts
+        # Creez senzori separați pentru fiecare județ/regiune
+        new_sensors = []
+        for county in view.selected_counties:
+            if county not in sensors:
+                sensors[county] = sensor_class(view, entry, county)
+                new_sensors.append(sensors[county])
+        if new_sensors:
+            async_add_entities(new_sensors)
     
-    def _normalize_county(self, county: str) -> str:
-        """Normalize county name for comparison (lowercase, strip whitespace)."""
-        return county.strip().lower()
-
-    def _parse_alert_element(self, element: ET.Element) -> list[dict[str, Any]] | None:
-        """Parse an avertizare XML element with attributes and split by county."""
-        try:
-            # Extrage toate atributele din noul format API
-            tip_mesaj = element.get("tipMesaj", "")
-            nume_tip_mesaj = element.get("numeTipMesaj", "")
-            data_inceput = element.get("dataInceput", "")
-            data_sfarsit = element.get("dataSfarsit", "")
-            zona = element.get("zona", "")
-            semnalare = element.get("semnalare", "")
-            culoare = element.get("culoare", "")
-            nume_culoare = element.get("numeCuloare", "")
-            modificat = element.get("modificat", "")
-            creat = element.get("creat", "")
-            
-            # Decodare HTML entities (&#x21B; = ț, &#xE2; = â, etc.)
-            zona = unescape(zona)
-            semnalare = unescape(semnalare)
-            nume_culoare = unescape(nume_culoare)
-            
-            # Extragere județe din câmpul zona
-            counties = self._extract_counties_from_zona(zona)
-            
-            # Dacă nu s-au găsit județe, returnează o singură alertă cu zona completă
-            if not counties:
-                _LOGGER.debug("No counties extracted from zona: %s", zona)
-                counties = ["Necunoscut"]
-            
-            # Parsare date și ore - se face o singură dată
-            start_time = None
-            end_time = None
-            
-            if data_inceput:
-                try:
-                    dt = dt_util.parse_datetime(data_inceput)
-                    if dt and dt.tzinfo is None:
-                        # API-ul returnează timpul în timezone-ul local (România/București)
-                        # Nu este UTC, așa că îl setăm direct la timezone-ul default
-                        dt = dt_util.as_local(dt)
-                    start_time = dt
-                except Exception as err:
-                    _LOGGER.warning("Could not parse start time '%s': %s", data_inceput, err)
-            
-            if data_sfarsit:
-                try:
-                    dt = dt_util.parse_datetime(data_sfarsit)
-                    if dt and dt.tzinfo is None:
-                        # API-ul returnează timpul în timezone-ul local (România/București)
-                        # Nu este UTC, așa că îl setăm direct la timezone-ul default
-                        dt = dt_util.as_local(dt)
-                    end_time = dt
-                except Exception as err:
-                    _LOGGER.warning("Could not parse end time '%s': %s", data_sfarsit, err)
-            
-            # Detectare fenomen din descriere
-            phenomena = self._detect_phenomena(semnalare.lower())
-            
-            # Creează alerte separate pentru fiecare județ
-            alerts = []
-            for county in counties:
-                # Construire zona specifică pentru acest județ
-                county_zona = f"Județul {county}"
-                
-                # Construire dicționar alert specific județului
-                alert = {
-                    "id": f"{creat}_{culoare}_{tip_mesaj}_{county}",
-                    "title": f"{nume_tip_mesaj} - Cod {nume_culoare}",
-                    "description": semnalare,
-                    "severity": nume_culoare.lower(),
-                    "severity_level": SEVERITY_LEVELS.get(nume_culoare.lower(), "unknown"),
-                    "color_code": culoare,
-                    "message_type": tip_mesaj,
-                    "message_type_name": nume_tip_mesaj,
-                    "counties": [county],  # Doar acest județ
-                    "zona": county_zona,    # Zona simplificată pentru acest județ
-                    "zona_original": zona,  # Păstrează zona originală pentru referință
-                    "created": creat,
-                    "modified": modificat,
-                    "start_time": start_time,
-                    "end_time": end_time,
-                    # Valori RAW din API pentru atribute
-                    "dataInceput": data_inceput,
-                    "dataSfarsit": data_sfarsit,
-                    "numeCuloare": nume_culoare,
-                    "semnalare": semnalare,
-                    "zona_api": zona,
-                }
-                
-                if phenomena:
-                    alert["phenomena"] = phenomena
-                
-                alerts.append(alert)
-            
-            return alerts
-            
-        except Exception as err:
-            _LOGGER.error("Error parsing alert element: %s", err)
-            return None
-    
-    def _extract_counties_from_zona(self, zona: str) -> list[str]:
-        """Extract county names from zona field."""
-        counties = []
-        
-        # Elimină tag-uri HTML
-        zona_clean = re.sub(r'<[^>]+>', '', zona)
-        
-        # Caută județe menționate în text
-        # Exemplu: "Județul Cluj , zona de munte de peste 1800 m;"
-        for county in ROMANIAN_COUNTIES:
-            # Variantele posibile: "Județul X", "judetul X", "X"
-            patterns = [
-                rf'jude[țt]ul\s+{re.escape(county)}',
-                rf'\b{re.escape(county)}\b',
-            ]
-            for pattern in patterns:
-                if re.search(pattern, zona_clean, re.IGNORECASE):
-                    if county not in counties:
-                        counties.append(county)
-                    break
-        
-        return counties
-    
-    def _detect_phenomena(self, description: str) -> str:
-        """Detect phenomena type from description."""
-        # Mapare cuvinte cheie la fenomene
-        keywords_map = {
-            "ceata": "ceata",
-            "ceață": "ceata",
-            "polei": "polei",
-            "ninsoare": "ninsoare",
-            "ninsori": "ninsoare",
-            "viscol": "viscol",
-            "plo": "ploi_torentiale",  # Matches: ploi, ploaie, ploi torențiale
-            "torential": "ploi_torentiale",
-            "grindina": "grindina",
-            "grindină": "grindina",
-            "vijelie": "vijelie",
-            "furtuna": "vijelie",
-            "furtună": "vijelie",
-            "fulger": "fulger",
-            "descarcari electrice": "fulger",
-            "descărcări electrice": "fulger",
-            "vant": "vant_puternic",  # Matches: vânt, vant
-            "v[aâ]nt": "vant_puternic",
-            "rafal": "vant_puternic",
-            "rafalã": "vant_puternic",
-            "instabilitate": "instabilitate",
-        }
-        
-        for keyword, phenomena in keywords_map.items():
-            if keyword in description:
-                return phenomena
-        
-        return "default"
+    _async_sync_sensors()
+    async_add_entities(
+        AlerteNowcastingSummarySensor(view, entry, description) for description in SUMMARY_SENSORS
+    )
+    async_add_entities(
+        AlerteNowcastingTimingSensor(view, entry, description) for description in TIMING_SENSORS
+    )
+    entry.async_on_unload(
+        async_dispatcher_connect(
+            hass, SIGNAL_COUNTIES_UPDATED.format(entry.entry_id), _async_sync_sensors
+        )
+    )
 
 
 class AlerteNowcastingSensor(CoordinatorEntity, SensorEntity):
@@ -325,7 +220,7 @@ class AlerteNowcastingSensor(CoordinatorEntity, SensorEntity):
 
     def __init__(
         self,
-        coordinator: AlerteNowcastingCoordinator,
+        coordinator: AlerteNowcastingView,
         entry: ConfigEntry,
         county: str = "România",
     ) -> None:
@@ -338,92 +233,74 @@ class AlerteNowcastingSensor(CoordinatorEntity, SensorEntity):
         
         self._attr_name = f"Alerta Nowcasting {county}"
         self._attr_unique_id = f"{DOMAIN}_{entry.entry_id}_{county_slug}"
-        self._attr_icon = "mdi:weather-cloudy-alert"
+        
+        # Atribute și iconiță memorate per generație de date a coordinatorului
+        self._cache_generation = -1
+        self._cached_attributes: dict[str, Any] = {}
+        self._cached_icon = "mdi:weather-cloudy-alert"
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write state only when this sensor's county was affected by the update."""
+        changed = self.coordinator.changed_counties
+        if changed is not None and self.county != "România" and self.county not in changed:
+            return
+        super()._handle_coordinator_update()
 
     @property
     def native_value(self) -> str:
         """Return the state of the sensor - alerta or liniste."""
         if self.coordinator.data:
             # Verifică dacă există alerte pentru acest județ (active sau viitoare)
-            all_alerts = self.coordinator.data.get("alerts", [])
-            county_alerts = self._get_county_alerts(all_alerts)
-            if county_alerts:
+            if self._get_county_alerts():
                 return "alerta"
         
         return "liniste"
 
-    def _get_county_alerts(self, alerts: list[dict]) -> list[dict]:
-        """Filter alerts for this county."""
+    def _get_county_alerts(self, active: bool = False) -> list[CountyAlert]:
+        """Return the (active) alerts for this county from the coordinator index."""
+        data = self.coordinator.data
         if self.county == "România":
             # Return all alerts
-            return alerts
+            return data["active_alerts"] if active else data["alerts"]
         
-        # Filter alerts că conțin acest județ
-        county_alerts = []
-        for alert in alerts:
-            if self.county in alert.get("counties", []):
-                county_alerts.append(alert)
-        return county_alerts
+        index = data["county_active_alerts"] if active else data["county_alerts"]
+        return index.get(self.county, [])
     
-    def _filter_zona_for_county(self, zona_text: str, county: str) -> str:
-        """Extract only the relevant part of zona text for the current county."""
-        if not zona_text or county == "România":
-            return zona_text
-        
-        # Split după <br> sau ; urmat de "Județul"
-        # Pattern: ;<br> sau <br> sau doar ; când urmează "Județul"
-        parts = re.split(r';?<br\s*/?>|;(?=\s*Jude[țt])', zona_text, flags=re.IGNORECASE)
-        
-        # Caută partea care conține județul curent
-        county_pattern = rf'Jude[țt]ul\s+{re.escape(county)}\s*:'
-        for part in parts:
-            if re.search(county_pattern, part, re.IGNORECASE):
-                # Elimină whitespace și returnează doar această parte
-                return part.strip()
-        
-        # Dacă nu găsește, returnează textul original
-        return zona_text
+    def _update_cache(self) -> None:
+        """Recompute attributes and icon once per coordinator data generation."""
+        generation = self.coordinator.generation
+        if generation == self._cache_generation:
+            return
+        self._cache_generation = generation
+        self._cached_attributes, self._cached_icon = self._build_attributes()
 
-    def _format_ro_datetime(self, value: str) -> str | None:
-        """Format datetime string to Romanian display format (DD.MM.YYYY HH:MM)."""
-        if not value:
-            return None
-        try:
-            dt = dt_util.parse_datetime(value)
-            if dt:
-                dt = dt_util.as_local(dt)
-                return dt.strftime("%d.%m.%Y %H:%M")
-        except Exception:
-            return value
-        return value
-
-    def _format_ro_time(self, value: str) -> str | None:
-        """Format datetime string to time only (HH:MM)."""
-        if not value:
-            return None
-        try:
-            dt = dt_util.parse_datetime(value)
-            if dt:
-                dt = dt_util.as_local(dt)
-                return dt.strftime("%H:%M")
-        except Exception:
-            return value
-        return value
+    @property
+    def icon(self) -> str:
+        """Return the icon for the phenomenon of the current alert."""
+        self._update_cache()
+        return self._cached_icon
 
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
         """Return the state attributes."""
+        self._update_cache()
+        return self._cached_attributes
+
+    def _build_attributes(self) -> tuple[dict[str, Any], str]:
+        """Build the state attributes and icon from the coordinator data."""
         if not self.coordinator.data:
-            return {}
+            return {}, "mdi:weather-cloudy-alert"
         
         data = self.coordinator.data
-        all_alerts = data.get("alerts", [])
-        active_alerts = self._get_county_alerts(data.get("active_alerts", []))
-        county_alerts = self._get_county_alerts(all_alerts)
+        active_alerts = self._get_county_alerts(active=True)
+        county_alerts = self._get_county_alerts()
         
         attributes = {
             "Alerte active": len(active_alerts),
-            "Ultima actualizare": self._format_ro_datetime(data.get("last_update", "")),
+            "Ultima actualizare": _format_ro_datetime(data.get("last_update", "")),
+            # API-ul nu răspunde și se afișează ultimele date bune
+            "Date învechite": data.get("stale_since") is not None,
             "Județ": self.county,
         }
         
@@ -436,44 +313,28 @@ class AlerteNowcastingSensor(CoordinatorEntity, SensorEntity):
             first_alert = county_alerts[0]
         
         if first_alert:
+            alert = first_alert.alert
+            # Id-ul stabil al alertei, pentru serviciul get_alert_details
+            attributes["ID"] = first_alert.id
             # Atribute RAW din API
-            culoare_raw = first_alert.get("numeCuloare", "")
-            culoare_map = {
-                "galben": "galben",
-                "portocaliu": "portocaliu",
-                "rosu": "roșu",
-            }
-            attributes["Culoare"] = culoare_map.get(culoare_raw, culoare_raw)
-            attributes["Început"] = self._format_ro_time(first_alert.get("dataInceput", ""))
-            attributes["Sfârșit"] = self._format_ro_time(first_alert.get("dataSfarsit", ""))
-            attributes["semnalare"] = first_alert.get("semnalare", "")
-            # Filtrează zona să conțină doar județul curent
-            zona_full = first_alert.get("zona_api", "")
-            attributes["Zone"] = self._filter_zona_for_county(zona_full, self.county)
+            culoare_raw = alert.severity_name
+            attributes["Culoare"] = SEVERITY_DISPLAY.get(culoare_raw, culoare_raw)
+            attributes["Început"] = alert.start_display
+            attributes["Sfârșit"] = alert.end_display
+            attributes["semnalare"] = alert.description
+            # Zona filtrată pe județul curent (calculată la parsare)
+            attributes["Zone"] = alert.zona if self.county == "România" else first_alert.zona
             
             # Alte informații utile
-            phenomena_raw = first_alert.get("phenomena", "default")
-            phenomena_map = {
-                "ceata": "ceață",
-                "polei": "polei",
-                "ninsoare": "ninsoare",
-                "viscol": "viscol",
-                "ploi_torentiale": "ploi torențiale",
-                "grindina": "grindină",
-                "vijelie": "vijelie",
-                "fulger": "fulgere",
-                "vant_puternic": "vânt puternic",
-                "instabilitate": "instabilitate",
-                "default": "-",
-            }
-            attributes["Fenomene"] = phenomena_map.get(phenomena_raw, phenomena_raw)
-            title_raw = first_alert.get("title", "")
-            title_fixed = title_raw.replace("Atentionare", "Atenționare")
+            attributes["Fenomene"] = ", ".join(
+                PHENOMENA_DISPLAY.get(phenomenon, phenomenon)
+                for phenomenon in alert.phenomena
+            ) or PHENOMENA_DISPLAY["default"]
+            title_fixed = alert.title.replace("Atentionare", "Atenționare")
             attributes["Titlu"] = title_fixed
             
-            # Setează iconița în funcție de fenomen
-            phenomena = first_alert.get("phenomena", "default")
-            self._attr_icon = PHENOMENA_ICONS.get(phenomena, PHENOMENA_ICONS["default"])
+            # Iconița în funcție de fenomen
+            icon = PHENOMENA_ICONS.get(alert.main_phenomenon, PHENOMENA_ICONS["default"])
         else:
             # Când nu există deloc alerte pentru acest județ
             attributes["Culoare"] = "verde"
@@ -481,11 +342,93 @@ class AlerteNowcastingSensor(CoordinatorEntity, SensorEntity):
             attributes["Sfârșit"] = "-"
             attributes["semnalare"] = "Nu e cazul"
             attributes["Zone"] = self.county
-            self._attr_icon = "mdi:weather-cloudy"
+            icon = "mdi:weather-cloudy"
         
-        return attributes
+        return attributes, icon
 
     @property
     def available(self) -> bool:
         """Return if entity is available."""
         return self.coordinator.last_update_success
+
+
+class AlerteNowcastingCompactSensor(AlerteNowcastingSensor):
+    """County sensor whose bulky text attributes are not stored in the recorder history.
+
+    The state, id, severity and times are still recorded; the full texts are
+    available through the get_alert_details service and the diagnostics.
+    """
+
+    _unrecorded_attributes = UNRECORDED_ATTRIBUTES
+
+
+class AlerteNowcastingTimingSensor(CoordinatorEntity, SensorEntity):
+    """Diagnostic sensor with the duration or size of one refresh stage."""
+
+    entity_description: AlerteNowcastingTimingDescription
+
+    def __init__(
+        self,
+        view: AlerteNowcastingView,
+        entry: ConfigEntry,
+        description: AlerteNowcastingTimingDescription,
+    ) -> None:
+        """Initialize the sensor."""
+        # Disponibilitatea vine de la coordinatorul partajat; starea se scrie la semnalul
+        # trimis după fiecare ciclu, după ce vederea a terminat filtrarea și notificarea
+        super().__init__(view.hub)
+        self.entity_description = description
+        self._view = view
+        self._attr_name = f"Alerta Nowcasting {description.name}"
+        self._attr_unique_id = f"{DOMAIN}_{entry.entry_id}_{description.key}"
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Ignore data updates; the timings signal writes the state once per cycle."""
+
+    async def async_added_to_hass(self) -> None:
+        """Follow the per-cycle timings signal, sent even when the data is unchanged."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass, self._view.hub.signal_timings, self.async_write_ha_state
+            )
+        )
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the last measured value of the stage."""
+        return self.entity_description.value_fn(self._view)
+
+
+class AlerteNowcastingSummarySensor(CoordinatorEntity, SensorEntity):
+    """Count of the entry's active alerts by severity level or phenomenon."""
+
+    entity_description: AlerteNowcastingSummaryDescription
+
+    def __init__(
+        self,
+        view: AlerteNowcastingView,
+        entry: ConfigEntry,
+        description: AlerteNowcastingSummaryDescription,
+    ) -> None:
+        """Initialize the sensor."""
+        # Contoarele vin gata calculate în payload-ul vederii intrării
+        super().__init__(view)
+        self.entity_description = description
+        self._attr_name = f"Alerta Nowcasting {description.name}"
+        self._attr_unique_id = f"{DOMAIN}_{entry.entry_id}_{description.key}"
+
+    @property
+    def native_value(self) -> int | None:
+        """Return the counter of the summary."""
+        if not self.coordinator.data:
+            return None
+        return self.entity_description.value_fn(self.coordinator.data["summary"])
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the breakdown of the counter."""
+        if not self.coordinator.data:
+            return {}
+        return self.entity_description.attrs_fn(self.coordinator.data["summary"])
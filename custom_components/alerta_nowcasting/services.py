@@ -0,0 +1,85 @@
+"""Services for Alerte Nowcasting integration."""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+import voluptuous as vol
+
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.helpers import config_validation as cv
+
+from .const import ATTR_ALERT_ID, ATTR_COUNTY, DOMAIN, SERVICE_GET_ALERT_DETAILS
+from .parser import county_key
+
+if TYPE_CHECKING:
+    from .coordinator import AlerteNowcastingView
+    from .models import CountyAlert
+
+GET_ALERT_DETAILS_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_COUNTY): cv.string,
+        vol.Optional(ATTR_ALERT_ID): cv.string,
+    }
+)
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the Alerte Nowcasting services."""
+
+    async def _async_get_alert_details(call: ServiceCall) -> ServiceResponse:
+        """Return the full text of the alerts known to the loaded entries."""
+        alert_id = call.data.get(ATTR_ALERT_ID)
+        key = county_key(call.data[ATTR_COUNTY]) if ATTR_COUNTY in call.data else None
+
+        # Aceeași alertă poate apărea în mai multe intrări: o întoarcem o singură dată
+        details: dict[str, dict[str, Any]] = {}
+        for entry in hass.config_entries.async_entries(DOMAIN):
+            view: AlerteNowcastingView | None = hass.data.get(DOMAIN, {}).get(entry.entry_id)
+            if view is None or not view.data:
+                continue
+            active = {county_alert.id for county_alert in view.data["active_alerts"]}
+            for county_alert in view.data["alerts"]:
+                if alert_id is not None and county_alert.id != alert_id:
+                    continue
+                if key is not None and county_key(county_alert.county) != key:
+                    continue
+                if county_alert.id not in details:
+                    details[county_alert.id] = _alert_details(
+                        county_alert, county_alert.id in active
+                    )
+
+        return {"alerts": list(details.values())}
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_ALERT_DETAILS,
+        _async_get_alert_details,
+        schema=GET_ALERT_DETAILS_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+
+def _alert_details(county_alert: CountyAlert, active: bool) -> dict[str, Any]:
+    """Return the JSON serializable details of an alert, including the full texts."""
+    alert = county_alert.alert
+    return {
+        "id": county_alert.id,
+        "county": county_alert.county,
+        "title": alert.title,
+        "severity": alert.severity,
+        "severity_level": alert.severity_level,
+        "phenomena": list(alert.phenomena),
+        "start": alert.start_time.isoformat() if alert.start_time else None,
+        "end": alert.end_time.isoformat() if alert.end_time else None,
+        "active": active,
+        "semnalare": alert.description,
+        "zona": county_alert.zona,
+        "zona_api": alert.zona,
+    }
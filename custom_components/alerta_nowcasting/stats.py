@@ -0,0 +1,58 @@
+"""Refresh timing statistics for Alerte Nowcasting integration."""
+from __future__ import annotations
+
+import bisect
+from collections import deque
+from typing import Any
+
+# Limitele histogramelor: durate în ms, dimensiuni în octeți
+DURATION_BUCKETS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+SIZE_BUCKETS = (1024, 4096, 16384, 65536, 262144, 1048576)
+
+# Câte măsurători recente păstrăm pentru fiecare etapă
+_HISTORY_SIZE = 100
+
+
+class StageTimings:
+    """Last value and rolling window of per-stage refresh measurements.
+
+    Stages ending in "_ms" are durations, stages ending in "_bytes" are sizes.
+    """
+
+    def __init__(self, size: int = _HISTORY_SIZE) -> None:
+        """Initialize."""
+        self.last: dict[str, float] = {}
+        self._size = size
+        self._history: dict[str, deque[float]] = {}
+
+    def record(self, stage: str, value: float) -> None:
+        """Store a measurement for a stage."""
+        self.last[stage] = value
+        if (history := self._history.get(stage)) is None:
+            history = self._history[stage] = deque(maxlen=self._size)
+        history.append(value)
+
+    def histogram(self, stage: str) -> dict[str, int]:
+        """Return the bucket counts of the rolling window for a stage."""
+        buckets = SIZE_BUCKETS if stage.endswith("_bytes") else DURATION_BUCKETS
+        counts = [0] * (len(buckets) + 1)
+        for value in self._history.get(stage, ()):
+            counts[bisect.bisect_left(buckets, value)] += 1
+        labels = [f"<={bucket}" for bucket in buckets] + [f">{buckets[-1]}"]
+        return dict(zip(labels, counts))
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return last value, percentiles and histogram for every stage."""
+        result = {}
+        for stage, history in self._history.items():
+            values = sorted(history)
+            result[stage] = {
+                "last": self.last[stage],
+                "count": len(values),
+                "min": values[0],
+                "p50": values[len(values) // 2],
+                "p95": values[min(len(values) - 1, int(len(values) * 0.95))],
+                "max": values[-1],
+                "histogram": self.histogram(stage),
+            }
+        return result